@@ -0,0 +1,55 @@
+"""Add products.category_encoded
+
+Revision ID: 002_product_category_encoded
+Revises: 001_initial
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002_product_category_encoded'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Snapshot of src.db.models.CATEGORY_ENCODING at the time of this migration
+CATEGORY_ENCODING = {
+    "Electronics": 0,
+    "Home & Kitchen": 1,
+    "Toys & Games": 2,
+    "Sports & Outdoors": 3,
+    "Beauty & Personal Care": 4,
+    "Health & Household": 5,
+    "Clothing": 6,
+    "Books": 7,
+    "Mobiles": 8,
+    "Fashion": 9,
+    "Appliances": 10,
+    "Grocery": 11,
+}
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('category_encoded', sa.SmallInteger, nullable=True))
+    op.create_index('ix_products_category_encoded', 'products', ['category_encoded'])
+
+    # Backfill existing rows; unknown categories get -1
+    products = sa.table(
+        'products',
+        sa.column('category', sa.String),
+        sa.column('category_encoded', sa.SmallInteger),
+    )
+    op.execute(
+        products.update().values(
+            category_encoded=sa.case(CATEGORY_ENCODING, value=products.c.category, else_=-1)
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_category_encoded', table_name='products')
+    op.drop_column('products', 'category_encoded')
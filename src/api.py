@@ -1,5 +1,7 @@
 """HTTP API for CTX Protocol wrapper to consume."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -12,14 +14,24 @@ from src.db.repositories.brand_repository import BrandRepository
 from src.db.repositories.alert_repository import AlertRepository
 from src.intelligence import IntelligenceEngine, IntelligenceFormatter, ArbitrageAnalyzer
 from src.intelligence.brand_analyzer import BrandAnalyzer
-from src.ml.features import FeatureEngineer
+from src.ml.features import DEFAULT_FEATURE_ENGINEER
 from src.ml.models import DemandForecaster
 from src.mcp.tools import extract_product_id
+from src.scrapers.base import stop_playwright
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Scrapers share one Playwright driver; stop it with the server
+    await stop_playwright()
+
 
 app = FastAPI(
     title="CommerceSignal API",
     description="E-commerce Intelligence API for CTX Protocol",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -332,16 +344,18 @@ async def forecast_demand(request: ForecastDemandRequest):
     
     async with async_session_maker() as session:
         product_repo = ProductRepository(session)
-        metrics_repo = MetricsRepository(session)
         
         product = await product_repo.get_by_asin(product_id, platform)
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        metrics = await metrics_repo.get_last_n_days(product.id, 60)
+        if not await product_repo.has_min_metrics(product.id, days=60):
+            raise HTTPException(status_code=400, detail="Insufficient data for forecast")
+        
+        metrics = await product_repo.get_metrics_columns(product.id, 60)
         
-        engineer = FeatureEngineer()
-        features = engineer.engineer_features(product, metrics)
+        engineer = DEFAULT_FEATURE_ENGINEER
+        features = engineer.engineer_features(product, metrics, presorted=True)
         
         if not features:
             raise HTTPException(status_code=400, detail="Insufficient data for forecast")
@@ -14,9 +14,14 @@ class Base(DeclarativeBase):
     pass
 
 
+# Async engines default to AsyncAdaptedQueuePool; keep it (never NullPool) so
+# every `async_session_maker()` context checks out a warm pooled connection
+# instead of dialing a new one. Size the pool to expected handler concurrency.
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
     pool_pre_ping=True,
 )
 
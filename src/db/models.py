@@ -4,8 +4,11 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
+from types import MappingProxyType
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import (
+    Boolean, Date, DateTime, ForeignKey, Integer, Numeric, SmallInteger, String, Text, func
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,6 +26,23 @@ class Platform(str, Enum):
     SHOPIFY = "shopify"
 
 
+# Category -> Product.category_encoded, assigned at ingest and read by the ML
+# features (read-only so it can't drift at runtime)
+CATEGORY_ENCODING = MappingProxyType({
+    "Electronics": 0,
+    "Home & Kitchen": 1,
+    "Toys & Games": 2,
+    "Sports & Outdoors": 3,
+    "Beauty & Personal Care": 4,
+    "Health & Household": 5,
+    "Clothing": 6,
+    "Books": 7,
+    "Mobiles": 8,
+    "Fashion": 9,
+    "Appliances": 10,
+    "Grocery": 11,
+})
+
 
 class Product(Base):
     """Product entity representing an e-commerce product."""
@@ -37,6 +57,10 @@ class Product(Base):
     url: Mapped[str] = mapped_column(Text, nullable=False)
     title: Mapped[str] = mapped_column(Text, nullable=False)
     category: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
+    # CATEGORY_ENCODING value, assigned at ingest
+    category_encoded: Mapped[int | None] = mapped_column(
+        SmallInteger, nullable=True, index=True
+    )
     brand: Mapped[str | None] = mapped_column(String(200), nullable=True)
     image_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -1,4 +1,4 @@
-from .product_repository import ProductRepository
+from .product_repository import ProductRepository, MetricsRow
 from .metrics_repository import MetricsRepository
 
-__all__ = ["ProductRepository", "MetricsRepository"]
+__all__ = ["ProductRepository", "MetricsRepository", "MetricsRow"]
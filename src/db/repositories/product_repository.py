@@ -1,18 +1,52 @@
 """Product repository for database operations."""
 
 import uuid
-from datetime import date
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import NamedTuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.db.models import Product, DailyMetric
+from src.db.models import CATEGORY_ENCODING, Product, DailyMetric
+
+
+class MetricsRow(NamedTuple):
+    """Column projection of DailyMetric used by feature engineering."""
+
+    date: date
+    price: Decimal
+    rank: int | None
+    reviews: int
+    rating: float
+    discount_percent: float | None
+    delivery_days: int | None
+    seller_count: int
+    in_stock: bool
+
+
+# Column order matches MetricsRow
+_METRICS_COLUMNS = (
+    DailyMetric.date,
+    DailyMetric.price,
+    DailyMetric.rank,
+    DailyMetric.reviews,
+    DailyMetric.rating,
+    DailyMetric.discount_percent,
+    DailyMetric.delivery_days,
+    DailyMetric.seller_count,
+    DailyMetric.in_stock,
+)
 
 
 class ProductRepository:
     """Repository for Product CRUD operations."""
 
+    # Product IDs per IN (...) query in get_metrics_columns_bulk, kept well
+    # under driver bind-parameter limits
+    BULK_CHUNK_SIZE = 1000
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -70,6 +104,7 @@ class ProductRepository:
             url=url,
             title=title,
             category=category,
+            category_encoded=CATEGORY_ENCODING.get(category, -1),
             brand=brand,
             image_url=image_url,
         )
@@ -140,6 +175,66 @@ class ProductRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_metrics_columns(
+        self, product_id: uuid.UUID, days: int = 30
+    ) -> list[MetricsRow]:
+        """Get feature columns for the last N days of metrics, newest first.
+
+        Selects only the columns feature engineering reads, so rows come back
+        as plain tuples without ORM entity hydration.
+        """
+        start_date = date.today() - timedelta(days=days)
+        stmt = (
+            select(*_METRICS_COLUMNS)
+            .where(
+                DailyMetric.product_id == product_id,
+                DailyMetric.date >= start_date,
+            )
+            .order_by(DailyMetric.date.desc())
+        )
+        result = await self.session.execute(stmt)
+        return [MetricsRow(*row) for row in result.all()]
+
+    async def get_metrics_columns_bulk(
+        self, product_ids: list[uuid.UUID], days: int = 30
+    ) -> dict[uuid.UUID, list[MetricsRow]]:
+        """Get get_metrics_columns rows for many products at once.
+
+        Issues one `product_id IN (...)` query per BULK_CHUNK_SIZE products
+        instead of one query per product. Each list is newest first; products
+        without metrics in the window are absent from the result.
+        """
+        start_date = date.today() - timedelta(days=days)
+        metrics_by_product: dict[uuid.UUID, list[MetricsRow]] = {}
+        for i in range(0, len(product_ids), self.BULK_CHUNK_SIZE):
+            stmt = (
+                select(DailyMetric.product_id, *_METRICS_COLUMNS)
+                .where(
+                    DailyMetric.product_id.in_(product_ids[i:i + self.BULK_CHUNK_SIZE]),
+                    DailyMetric.date >= start_date,
+                )
+                .order_by(DailyMetric.product_id, DailyMetric.date.desc())
+            )
+            result = await self.session.execute(stmt)
+            for product_id, *columns in result.all():
+                metrics_by_product.setdefault(product_id, []).append(MetricsRow(*columns))
+        return metrics_by_product
+
+    async def has_min_metrics(
+        self, product_id: uuid.UUID, n: int = 7, days: int | None = None
+    ) -> bool:
+        """Check whether a product has at least n metrics (optionally in the last N days).
+
+        Runs `EXISTS (SELECT ... OFFSET n-1)` so sparse products can be rejected
+        without transferring their metric rows.
+        """
+        stmt = select(DailyMetric.id).where(DailyMetric.product_id == product_id)
+        if days is not None:
+            stmt = stmt.where(DailyMetric.date >= date.today() - timedelta(days=days))
+        stmt = select(stmt.offset(n - 1).limit(1).exists())
+        result = await self.session.execute(stmt)
+        return bool(result.scalar())
+
     async def count_by_platform(self, platform: str) -> int:
         """Count products by platform."""
         from sqlalchemy import func
@@ -151,10 +151,10 @@ async def collect_metrics(platform: str, scraper_class):
         print(f"[{platform}] Collecting metrics for {len(products)} products")
         
         async with scraper_class() as scraper:
-            for product in products:
+            # Scrape concurrently; DB writes stay serial on the one session
+            results = await scraper.scrape_many([product.url for product in products])
+            for product, product_data in zip(products, results):
                 try:
-                    product_data = await scraper.scrape_with_retry(product.url)
-                    
                     if product_data:
                         await metrics_repo.create(
                             product_id=product.id,
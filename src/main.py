@@ -9,6 +9,7 @@ from src.config import settings
 from src.db.database import init_db
 from src.mcp import create_mcp_server
 from src.jobs import create_scheduler
+from src.scrapers.base import stop_playwright
 
 
 async def run_mcp_server():
@@ -22,12 +23,15 @@ async def run_mcp_server():
     server = create_mcp_server()
 
     # Run with stdio transport
-    async with stdio_server() as streams:
-        await server.run(
-            streams[0],
-            streams[1],
-            server.create_initialization_options(),
-        )
+    try:
+        async with stdio_server() as streams:
+            await server.run(
+                streams[0],
+                streams[1],
+                server.create_initialization_options(),
+            )
+    finally:
+        await stop_playwright()
 
 
 async def run_with_scheduler():
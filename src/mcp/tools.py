@@ -619,26 +619,25 @@ async def forecast_demand_handler(arguments: dict) -> str:
     if not product_id:
         return f"Error: Could not extract product ID from URL: {url}"
 
-    from src.ml.features import FeatureEngineer
+    from src.ml.features import DEFAULT_FEATURE_ENGINEER
     from src.ml.models import DemandForecaster
 
     async with async_session_maker() as session:
         product_repo = ProductRepository(session)
-        metrics_repo = MetricsRepository(session)
 
         product = await product_repo.get_by_asin(product_id, platform)
 
         if not product:
             return f"Product not found. Add it first using analyze_product."
 
-        metrics = await metrics_repo.get_last_n_days(product.id, 60)
-
-        if len(metrics) < 7:
+        if not await product_repo.has_min_metrics(product.id, days=60):
             return "Insufficient data. Need at least 7 days of metrics for forecasting."
 
+        metrics = await product_repo.get_metrics_columns(product.id, 60)
+
         # Engineer features
-        feature_eng = FeatureEngineer()
-        features = feature_eng.engineer_features(product, metrics)
+        feature_eng = DEFAULT_FEATURE_ENGINEER
+        features = feature_eng.engineer_features(product, metrics, presorted=True)
 
         if not features:
             return "Could not generate features. Need more historical data."
@@ -689,26 +688,25 @@ async def predict_price_handler(arguments: dict) -> str:
     if not product_id:
         return f"Error: Could not extract product ID from URL: {url}"
 
-    from src.ml.features import FeatureEngineer
+    from src.ml.features import DEFAULT_FEATURE_ENGINEER
     from src.ml.models import PricePredictor
 
     async with async_session_maker() as session:
         product_repo = ProductRepository(session)
-        metrics_repo = MetricsRepository(session)
 
         product = await product_repo.get_by_asin(product_id, platform)
 
         if not product:
             return f"Product not found. Add it first using analyze_product."
 
-        metrics = await metrics_repo.get_last_n_days(product.id, 60)
-
-        if len(metrics) < 7:
+        if not await product_repo.has_min_metrics(product.id, days=60):
             return "Insufficient data. Need at least 7 days of metrics."
 
+        metrics = await product_repo.get_metrics_columns(product.id, 60)
+
         # Engineer features
-        feature_eng = FeatureEngineer()
-        features = feature_eng.engineer_features(product, metrics)
+        feature_eng = DEFAULT_FEATURE_ENGINEER
+        features = feature_eng.engineer_features(product, metrics, presorted=True)
 
         if not features:
             return "Could not generate features."
@@ -751,34 +749,34 @@ async def predict_stockout_handler(arguments: dict) -> str:
     if not product_id:
         return f"Error: Could not extract product ID from URL: {url}"
 
-    from src.ml.features import FeatureEngineer
+    from src.ml.features import DEFAULT_FEATURE_ENGINEER
     from src.ml.models import StockoutPredictor
 
     async with async_session_maker() as session:
         product_repo = ProductRepository(session)
-        metrics_repo = MetricsRepository(session)
 
         product = await product_repo.get_by_asin(product_id, platform)
 
         if not product:
             return f"Product not found. Add it first using analyze_product."
 
-        metrics = await metrics_repo.get_last_n_days(product.id, 30)
-
-        if len(metrics) < 7:
+        if not await product_repo.has_min_metrics(product.id, days=30):
             return "Insufficient data. Need at least 7 days of metrics."
 
+        metrics = await product_repo.get_metrics_columns(product.id, 30)
+
         # Engineer features
-        feature_eng = FeatureEngineer()
-        features = feature_eng.engineer_features(product, metrics)
+        feature_eng = DEFAULT_FEATURE_ENGINEER
+        features = feature_eng.engineer_features(product, metrics, presorted=True)
 
         if not features:
             return "Could not generate features."
 
-        # Extract history from metrics
-        delivery_history = [m.delivery_days or 3 for m in metrics]
-        seller_history = [m.seller_count for m in metrics]
-        stock_history = [m.in_stock for m in metrics]
+        # Extract history from metrics; the predictor reads at most 14 days
+        recent = metrics[:14]
+        delivery_history = [m.delivery_days or 3 for m in recent]
+        seller_history = [m.seller_count for m in recent]
+        stock_history = [m.in_stock for m in recent]
 
         # Predict stockout
         predictor = StockoutPredictor()
@@ -859,26 +857,31 @@ async def subscribe_alert_handler(arguments: dict) -> str:
 
         await session.commit()
 
-        return f"""# 🔔 Alert Subscription Created
-**ID:** {subscription.id}
+        # Capture primitives so the connection returns to the pool before formatting
+        sub_id = subscription.id
+        sub_channel = subscription.notification_channel
+        product_title = product.title
+
+    return f"""# 🔔 Alert Subscription Created
+**ID:** {sub_id}
 **Type:** {alert_type.replace('_', ' ').title()}
 
 ## Configuration
 | Setting | Value |
 |---------|-------|
-| **Product** | {product.title[:40]}... |
+| **Product** | {product_title[:40]}... |
 | **Platform** | {platform} |
 | **Threshold** | {threshold or 'Default'}% |
-| **Channel** | {subscription.notification_channel.upper()} |
+| **Channel** | {sub_channel.upper()} |
 | **Status** | ✅ Active |
 
 ## What Happens Next
 - We'll monitor this product for {alert_type.replace('_', ' ')} events
-- You'll be notified via {subscription.notification_channel}
+- You'll be notified via {sub_channel}
 - Use `list_alerts` to view all subscriptions
 
 ---
-*Subscription ID: {subscription.id}*"""
+*Subscription ID: {sub_id}*"""
 
 
 async def list_alerts_handler(arguments: dict) -> str:
@@ -946,13 +949,13 @@ async def unsubscribe_alert_handler(arguments: dict) -> str:
         success = await alert_repo.deactivate(sub_uuid)
         await session.commit()
 
-        if success:
-            return f"""# ✅ Alert Unsubscribed
+    if success:
+        return f"""# ✅ Alert Unsubscribed
 **Subscription ID:** {subscription_id}
 
 The alert has been deactivated. You will no longer receive notifications.
 
 Use `subscribe_alert` to create a new alert subscription."""
-        else:
-            return f"Error: Subscription not found with ID: {subscription_id}"
+    else:
+        return f"Error: Subscription not found with ID: {subscription_id}"
 
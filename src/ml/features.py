@@ -1,12 +1,15 @@
 """Feature engineering for ML models."""
 
+import math
+import operator
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Optional
 import numpy as np
 
-from src.db.models import Product, DailyMetric
+from src.db.models import CATEGORY_ENCODING, Product
+from src.db.repositories.product_repository import MetricsRow
 
 
 @dataclass
@@ -50,36 +53,73 @@ class ProductFeatures:
     category_encoded: int
 
 
+# Model input dtype, shared by training and inference so split thresholds
+# see identically rounded values; float32 halves the matrix bytes
+FEATURE_DTYPE = np.float32
+
+# Model input column order for features_to_array / features_list_to_matrix
+FEATURE_NAMES = (
+    "current_price",
+    "current_rank",
+    "current_reviews",
+    "current_rating",
+    "price_mean_7d",
+    "price_std_7d",
+    "price_min_30d",
+    "price_max_30d",
+    "price_trend_7d",
+    "discount_frequency",
+    "rank_mean_7d",
+    "rank_std_7d",
+    "rank_improvement_7d",
+    "rank_improvement_30d",
+    "best_rank_30d",
+    "review_velocity_7d",
+    "review_velocity_30d",
+    "review_acceleration",
+    "day_of_week",
+    "day_of_month",
+    "is_weekend",
+    "is_month_end",
+    "category_encoded",
+)
+
+
 class FeatureEngineer:
     """Engineers features for ML models from raw metrics."""
 
-    # Category encoding mapping
-    CATEGORY_ENCODING = {
-        "Electronics": 0,
-        "Home & Kitchen": 1,
-        "Toys & Games": 2,
-        "Sports & Outdoors": 3,
-        "Beauty & Personal Care": 4,
-        "Health & Household": 5,
-        "Clothing": 6,
-        "Books": 7,
-        "Mobiles": 8,
-        "Fashion": 9,
-        "Appliances": 10,
-        "Grocery": 11,
-    }
+    # Reads every model input field in one C-level call
+    _feature_getter = staticmethod(operator.attrgetter(*FEATURE_NAMES))
+
+    # Category encoding mapping, applied once at ingest and stored on
+    # Product.category_encoded
+    CATEGORY_ENCODING = CATEGORY_ENCODING
 
     def engineer_features(
         self,
         product: Product,
-        metrics: list[DailyMetric],
+        metrics: list[MetricsRow],
+        reference_date: date | None = None,
+        presorted: bool = False,
     ) -> ProductFeatures | None:
-        """Engineer features from product metrics."""
+        """
+        Engineer features from product metrics.
+
+        Accepts MetricsRow tuples from ProductRepository.get_metrics_columns;
+        full DailyMetric entities work too since only the same columns are read.
+        Seasonality features are computed for reference_date (default: today),
+        so batch callers can pass one date for every product.
+        Pass presorted=True when metrics are already newest-first (as
+        get_metrics_columns returns them) to skip the re-sort.
+        """
         if len(metrics) < 7:
             return None
 
         # Sort by date descending
-        sorted_metrics = sorted(metrics, key=lambda m: m.date, reverse=True)
+        if presorted:
+            sorted_metrics = metrics
+        else:
+            sorted_metrics = sorted(metrics, key=operator.attrgetter("date"), reverse=True)
 
         # Get windows
         latest = sorted_metrics[0]
@@ -95,8 +135,7 @@ class FeatureEngineer:
         # Price features
         prices_7d = [float(m.price) for m in last_7]
         prices_30d = [float(m.price) for m in last_30]
-        price_mean_7d = np.mean(prices_7d)
-        price_std_7d = np.std(prices_7d)
+        price_mean_7d, price_std_7d = self._mean_std(prices_7d)
         price_min_30d = min(prices_30d)
         price_max_30d = max(prices_30d)
         price_trend_7d = self._calculate_slope(prices_7d)
@@ -107,8 +146,7 @@ class FeatureEngineer:
         ranks_30d = [float(m.rank) for m in last_30 if m.rank]
 
         if ranks_7d:
-            rank_mean_7d = np.mean(ranks_7d)
-            rank_std_7d = np.std(ranks_7d)
+            rank_mean_7d, rank_std_7d = self._mean_std(ranks_7d)
             rank_improvement_7d = ranks_7d[-1] - ranks_7d[0] if len(ranks_7d) > 1 else 0
         else:
             rank_mean_7d = 0.0
@@ -138,14 +176,14 @@ class FeatureEngineer:
             review_acceleration = 0.0
 
         # Seasonality features
-        today = date.today()
+        today = reference_date or date.today()
         day_of_week = today.weekday()
         day_of_month = today.day
         is_weekend = day_of_week >= 5
         is_month_end = day_of_month >= 25
 
         # Category encoding
-        category_encoded = self.CATEGORY_ENCODING.get(product.category, -1)
+        category_encoded = product.category_encoded if product.category_encoded is not None else -1
 
         return ProductFeatures(
             product_id=str(product.id),
@@ -174,67 +212,67 @@ class FeatureEngineer:
             category_encoded=category_encoded,
         )
 
-    def features_to_array(self, features: ProductFeatures) -> np.ndarray:
-        """Convert features to numpy array for model input."""
-        return np.array([
-            features.current_price,
-            features.current_rank,
-            features.current_reviews,
-            features.current_rating,
-            features.price_mean_7d,
-            features.price_std_7d,
-            features.price_min_30d,
-            features.price_max_30d,
-            features.price_trend_7d,
-            features.discount_frequency,
-            features.rank_mean_7d,
-            features.rank_std_7d,
-            features.rank_improvement_7d,
-            features.rank_improvement_30d,
-            features.best_rank_30d,
-            features.review_velocity_7d,
-            features.review_velocity_30d,
-            features.review_acceleration,
-            features.day_of_week,
-            features.day_of_month,
-            float(features.is_weekend),
-            float(features.is_month_end),
-            features.category_encoded,
-        ])
+    def features_to_array(
+        self,
+        features: ProductFeatures,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Convert features to numpy array for model input.
+
+        If out is given (a length-F FEATURE_DTYPE array, e.g. a row of a
+        reused buffer), the values are written into it instead of a new array.
+        """
+        if out is None:
+            return np.array(self._feature_getter(features), dtype=FEATURE_DTYPE)
+        out[:] = self._feature_getter(features)
+        return out
+
+    def features_list_to_matrix(self, features_list: list[ProductFeatures]) -> np.ndarray:
+        """
+        Convert many feature sets to an (N, F) model input matrix.
+
+        Rows are written straight into one preallocated array instead of
+        stacking a separate array per product.
+        """
+        X = np.empty((len(features_list), len(FEATURE_NAMES)), dtype=FEATURE_DTYPE)
+        getter = self._feature_getter
+        for i, features in enumerate(features_list):
+            X[i] = getter(features)
+        return X
+
+    @staticmethod
+    def _mean_std(values: list[float]) -> tuple[float, float]:
+        """Mean and population std of a short list.
+
+        Plain sums beat np.mean/np.std on 7-30 values, where numpy's array
+        coercion and ufunc dispatch dominate the actual arithmetic.
+        """
+        n = len(values)
+        mean = sum(values) / n
+        variance = sum((v - mean) ** 2 for v in values) / n
+        return mean, math.sqrt(variance)
 
     def _calculate_slope(self, values: list[float]) -> float:
-        """Calculate linear regression slope."""
-        if len(values) < 2:
+        """Calculate linear regression slope.
+
+        Closed-form least squares over x = 0..n-1; same result as
+        np.polyfit(x, values, 1)[0] without the lstsq/SVD setup cost.
+        """
+        n = len(values)
+        if n < 2:
             return 0.0
-        x = np.arange(len(values))
-        slope, _ = np.polyfit(x, values, 1)
-        return float(slope)
+        x_mean = (n - 1) / 2
+        y_mean = sum(values) / n
+        sxy = sum((i - x_mean) * (v - y_mean) for i, v in enumerate(values))
+        sxx = n * (n * n - 1) / 12
+        return sxy / sxx
 
     @staticmethod
     def get_feature_names() -> list[str]:
         """Get ordered list of feature names."""
-        return [
-            "current_price",
-            "current_rank",
-            "current_reviews",
-            "current_rating",
-            "price_mean_7d",
-            "price_std_7d",
-            "price_min_30d",
-            "price_max_30d",
-            "price_trend_7d",
-            "discount_frequency",
-            "rank_mean_7d",
-            "rank_std_7d",
-            "rank_improvement_7d",
-            "rank_improvement_30d",
-            "best_rank_30d",
-            "review_velocity_7d",
-            "review_velocity_30d",
-            "review_acceleration",
-            "day_of_week",
-            "day_of_month",
-            "is_weekend",
-            "is_month_end",
-            "category_encoded",
-        ]
+        return list(FEATURE_NAMES)
+
+
+# Process-wide instance shared by the predictors and request handlers
+DEFAULT_FEATURE_ENGINEER = FeatureEngineer()
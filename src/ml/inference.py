@@ -1,10 +1,14 @@
 """ML model inference pipeline."""
 
+import asyncio
 from dataclasses import dataclass
+from datetime import date
 from typing import Optional
 
-from src.db.models import Product, DailyMetric
-from src.ml.features import FeatureEngineer, ProductFeatures
+from src.db.models import Product
+from src.db.repositories.product_repository import MetricsRow
+from src.ml.features import DEFAULT_FEATURE_ENGINEER, ProductFeatures
+from src.ml.model_registry import ModelRegistry
 from src.ml.models import (
     DemandForecaster,
     DemandForecast,
@@ -29,19 +33,51 @@ class ModelInference:
     Unified inference pipeline for all ML models.
 
     Manages model loading, feature engineering, and prediction.
+    Active registry models are loaded on first use by any predict_* method.
     """
 
-    def __init__(self):
-        self.feature_engineer = FeatureEngineer()
+    MODEL_NAMES = ("demand_forecaster", "price_predictor", "stockout_predictor")
+
+    def __init__(self, registry: ModelRegistry | None = None):
+        self.feature_engineer = DEFAULT_FEATURE_ENGINEER
         self.demand_forecaster = DemandForecaster()
         self.price_predictor = PricePredictor()
         self.stockout_predictor = StockoutPredictor()
-
-    def predict_all(
+        self.registry = registry
+        self._models_loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def _ensure_loaded(self) -> None:
+        """Load active registry models once, concurrently and off the event loop."""
+        if self._models_loaded:
+            return
+
+        async with self._load_lock:
+            if self._models_loaded:
+                return
+
+            registry = self.registry or ModelRegistry()
+            demand, price, stockout = await asyncio.gather(*(
+                asyncio.to_thread(registry.get_active_model, name)
+                for name in self.MODEL_NAMES
+            ))
+
+            # Keep the built-in predictors when no trained version is registered
+            if demand is not None:
+                self.demand_forecaster = demand
+            if price is not None:
+                self.price_predictor = price
+            if stockout is not None:
+                self.stockout_predictor = stockout
+
+            self._models_loaded = True
+
+    async def predict_all(
         self,
         product: Product,
-        metrics: list[DailyMetric],
+        metrics: list[MetricsRow],
         horizon_days: int = 7,
+        reference_date: date | None = None,
     ) -> InferenceResult:
         """
         Run all prediction models for a product.
@@ -50,12 +86,17 @@ class ModelInference:
             product: Product entity
             metrics: Historical metrics (at least 7 days)
             horizon_days: Forecast horizon
+            reference_date: Date for seasonality features (defaults to today)
 
         Returns:
             InferenceResult with predictions from all models
         """
+        await self._ensure_loaded()
+
         # Engineer features
-        features = self.feature_engineer.engineer_features(product, metrics)
+        features = self.feature_engineer.engineer_features(
+            product, metrics, reference_date
+        )
 
         if not features:
             return InferenceResult(
@@ -65,14 +106,21 @@ class ModelInference:
                 confidence=0.0,
             )
 
-        # Run predictions
         demand = self.demand_forecaster.predict(features, horizon_days)
+        return self._combine(features, metrics, demand, horizon_days)
+
+    def _combine(
+        self,
+        features: ProductFeatures,
+        metrics: list[MetricsRow],
+        demand: DemandForecast,
+        horizon_days: int,
+    ) -> InferenceResult:
+        """Run the remaining models and merge them with a demand forecast."""
         price = self.price_predictor.predict_price_trajectory(features, horizon_days)
 
         # Extract history for stockout prediction
-        delivery_history = [m.delivery_days or 3 for m in metrics[:14]]
-        seller_history = [m.seller_count for m in metrics[:14]]
-        stock_history = [m.in_stock for m in metrics[:14]]
+        delivery_history, seller_history, stock_history = self._extract_histories(metrics)
 
         stockout = self.stockout_predictor.predict_stockout_risk(
             features, delivery_history, seller_history, stock_history, horizon_days
@@ -92,45 +140,97 @@ class ModelInference:
             confidence=confidence,
         )
 
-    def predict_demand(
+    async def predict_all_batch(
+        self,
+        items: list[tuple[Product, list[MetricsRow]]],
+        horizon_days: int = 7,
+    ) -> list[InferenceResult]:
+        """
+        Run all prediction models for many products.
+
+        Seasonality features are computed once for the whole batch, and
+        demand is forecast for every product in a single model call.
+
+        Args:
+            items: (product, metrics) pairs
+            horizon_days: Forecast horizon
+
+        Returns:
+            InferenceResult per item, in input order
+        """
+        await self._ensure_loaded()
+
+        reference_date = date.today()
+        all_features = [
+            self.feature_engineer.engineer_features(product, metrics, reference_date)
+            for product, metrics in items
+        ]
+
+        ready = [i for i, features in enumerate(all_features) if features]
+        demands = self.demand_forecaster.predict_batch(
+            [all_features[i] for i in ready], horizon_days
+        )
+
+        results = [
+            InferenceResult(demand=None, price=None, stockout=None, confidence=0.0)
+            for _ in items
+        ]
+        for i, demand in zip(ready, demands):
+            results[i] = self._combine(all_features[i], items[i][1], demand, horizon_days)
+
+        return results
+
+    async def predict_demand(
         self,
         product: Product,
-        metrics: list[DailyMetric],
+        metrics: list[MetricsRow],
         horizon_days: int = 7,
     ) -> DemandForecast | None:
         """Run demand forecast only."""
+        await self._ensure_loaded()
         features = self.feature_engineer.engineer_features(product, metrics)
         if not features:
             return None
         return self.demand_forecaster.predict(features, horizon_days)
 
-    def predict_price(
+    async def predict_price(
         self,
         product: Product,
-        metrics: list[DailyMetric],
+        metrics: list[MetricsRow],
         horizon_days: int = 30,
     ) -> PricePrediction | None:
         """Run price prediction only."""
+        await self._ensure_loaded()
         features = self.feature_engineer.engineer_features(product, metrics)
         if not features:
             return None
         return self.price_predictor.predict_price_trajectory(features, horizon_days)
 
-    def predict_stockout(
+    async def predict_stockout(
         self,
         product: Product,
-        metrics: list[DailyMetric],
+        metrics: list[MetricsRow],
         horizon_days: int = 7,
     ) -> StockoutPrediction | None:
         """Run stockout prediction only."""
+        await self._ensure_loaded()
         features = self.feature_engineer.engineer_features(product, metrics)
         if not features:
             return None
 
-        delivery_history = [m.delivery_days or 3 for m in metrics[:14]]
-        seller_history = [m.seller_count for m in metrics[:14]]
-        stock_history = [m.in_stock for m in metrics[:14]]
+        delivery_history, seller_history, stock_history = self._extract_histories(metrics)
 
         return self.stockout_predictor.predict_stockout_risk(
             features, delivery_history, seller_history, stock_history, horizon_days
         )
+
+    @staticmethod
+    def _extract_histories(
+        metrics: list[MetricsRow],
+    ) -> tuple[list[int], list[int], list[bool]]:
+        """Extract 14-day delivery, seller and stock histories (newest first)."""
+        recent = metrics[:14]
+        delivery = [m.delivery_days or 3 for m in recent]
+        sellers = [m.seller_count for m in recent]
+        in_stock = [m.in_stock for m in recent]
+        return delivery, sellers, in_stock
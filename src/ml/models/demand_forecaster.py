@@ -3,13 +3,34 @@
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Any, ClassVar, Optional
 import json
 import os
 
 import numpy as np
 
-from src.ml.features import FeatureEngineer, ProductFeatures
+# Optional ML dependencies, resolved once at import time
+try:
+    import lightgbm as lgb
+except ImportError:
+    lgb = None
+
+try:
+    from sklearn.model_selection import train_test_split
+except ImportError:
+    train_test_split = None
+
+try:
+    import lleaves
+except ImportError:
+    lleaves = None
+
+from src.ml.features import (
+    DEFAULT_FEATURE_ENGINEER,
+    FEATURE_DTYPE,
+    FeatureEngineer,
+    ProductFeatures,
+)
 
 
 @dataclass
@@ -41,28 +62,102 @@ class ModelMetrics:
     r2: float
 
 
+class _CompiledBooster:
+    """
+    Adapter giving an lleaves-compiled model the Booster.predict call shape.
+
+    lleaves only takes a float64 matrix and a job count, so LightGBM-specific
+    keyword arguments are accepted and ignored.
+    """
+
+    def __init__(self, model):
+        self._model = model
+
+    def predict(self, X, **kwargs) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        # A single row isn't worth fanning out to a thread pool
+        n_jobs = 1 if len(X) == 1 else os.cpu_count()
+        return self._model.predict(X, n_jobs=n_jobs)
+
+
 class DemandForecaster:
     """
     Demand forecasting using LightGBM gradient boosting.
 
     Predicts daily sales for 7-day and 30-day horizons.
+
+    predict() fills a per-instance row buffer, so an instance must not be
+    shared across threads; use one per thread or predict_batch instead.
+    The loaded model itself is shared and safe to use concurrently.
     """
 
-    def __init__(self, model_path: str | None = None):
+    # (model file mtime, loaded model) by model_path, shared so new instances
+    # skip the disk load until the file is rewritten
+    _model_cache: ClassVar[dict[str, tuple[int, Any]]] = {}
+
+    def __init__(
+        self,
+        model_path: str | None = None,
+        feature_engineer: FeatureEngineer | None = None,
+        num_threads: int | None = None,
+    ):
         self.model = None
+        # Half the cores by default so training inside a worker pool doesn't
+        # oversubscribe the CPU; single-row predictions always use one thread
+        self.num_threads = num_threads or max(1, (os.cpu_count() or 2) // 2)
+        self._predict_params = {"num_threads": 1}
         self.model_path = model_path or "models/demand_forecaster.json"
-        self.feature_engineer = FeatureEngineer()
+        self.compiled_path = os.path.splitext(self.model_path)[0] + ".lleaves.o"
+        self.feature_engineer = feature_engineer or DEFAULT_FEATURE_ENGINEER
+        # Reused single-row input for predict(), same dtype as training
+        self._row_buffer = np.empty(
+            (1, len(FeatureEngineer.get_feature_names())), dtype=FEATURE_DTYPE
+        )
         self._load_model()
 
     def _load_model(self) -> None:
-        """Load trained model if exists."""
-        if os.path.exists(self.model_path):
+        """
+        Load trained model if exists.
+
+        Prefers an lleaves-compiled copy of the booster for inference when
+        lleaves is installed; the compiled object is cached next to the model
+        file so later loads skip compilation. Falls back to LightGBM.
+        Loaded models are cached per model_path and reloaded once the file's
+        mtime changes, e.g. after a training job in another process.
+        """
+        try:
+            mtime = os.stat(self.model_path).st_mtime_ns
+        except OSError:
+            DemandForecaster._model_cache.pop(self.model_path, None)
+            return
+
+        cached = DemandForecaster._model_cache.get(self.model_path)
+        if cached is not None and cached[0] == mtime:
+            self.model = cached[1]
+            return
+
+        if lleaves is not None:
+            try:
+                compiled = lleaves.Model(model_file=self.model_path)
+                compiled.compile(cache=self.compiled_path)
+                self.model = _CompiledBooster(compiled)
+            except Exception:
+                self.model = None
+
+        if self.model is None and lgb is not None:
             try:
-                import lightgbm as lgb
                 self.model = lgb.Booster(model_file=self.model_path)
             except Exception:
                 self.model = None
 
+        if self.model is not None:
+            DemandForecaster._model_cache[self.model_path] = (mtime, self.model)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached models so the next instance reloads from disk."""
+        cls._model_cache.clear()
+
     def train(
         self,
         features_list: list[ProductFeatures],
@@ -80,15 +175,13 @@ class DemandForecaster:
         Returns:
             ModelMetrics with evaluation results
         """
-        import lightgbm as lgb
-        from sklearn.model_selection import train_test_split
+        if lgb is None or train_test_split is None:
+            raise RuntimeError("lightgbm and scikit-learn are required to train DemandForecaster")
 
-        # Convert features to arrays
-        X = np.array([
-            self.feature_engineer.features_to_array(f)
-            for f in features_list
-        ])
-        y = np.array(targets)
+        # Convert features to arrays; LightGBM keeps labels as float32 anyway,
+        # so float32 targets train the same model with half the copies
+        X = self.feature_engineer.features_list_to_matrix(features_list)
+        y = np.asarray(targets, dtype=np.float32)
 
         # Split data
         X_train, X_val, y_train, y_val = train_test_split(
@@ -109,6 +202,7 @@ class DemandForecaster:
             "feature_fraction": 0.9,
             "bagging_fraction": 0.8,
             "bagging_freq": 5,
+            "num_threads": self.num_threads,
             "verbose": -1,
         }
 
@@ -125,6 +219,13 @@ class DemandForecaster:
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         self.model.save_model(self.model_path)
 
+        # Compiled copy belongs to the previous booster; rebuilt on next load
+        if os.path.exists(self.compiled_path):
+            os.remove(self.compiled_path)
+        DemandForecaster._model_cache[self.model_path] = (
+            os.stat(self.model_path).st_mtime_ns, self.model
+        )
+
         # Evaluate
         return self.evaluate(X_val, y_val)
 
@@ -147,71 +248,130 @@ class DemandForecaster:
             # Return heuristic prediction if no model
             return self._heuristic_prediction(features, horizon_days)
 
-        feature_array = self.feature_engineer.features_to_array(features)
+        self.feature_engineer.features_to_array(features, out=self._row_buffer[0])
 
-        # Generate predictions for each day
-        predictions = []
-        confidence_lower = []
-        confidence_upper = []
+        # One row: LightGBM's thread pool costs far more than the tree walk
+        base_predictions = self.model.predict(self._row_buffer, **self._predict_params)
 
-        base_prediction = float(self.model.predict([feature_array])[0])
+        return self._build_forecasts([features], base_predictions, horizon_days)[0]
 
-        for day in range(horizon_days):
-            # Adjust for day of week seasonality
-            adjusted_day = (features.day_of_week + day) % 7
-            weekend_factor = 1.2 if adjusted_day >= 5 else 1.0
+    def predict_batch(
+        self,
+        features_list: list[ProductFeatures],
+        horizon_days: int = 7,
+    ) -> list[DemandForecast]:
+        """
+        Predict demand for many products with a single model call.
 
-            daily_pred = base_prediction * weekend_factor
-            predictions.append(max(0, daily_pred))
+        Args:
+            features_list: Engineered features, one per product
+            horizon_days: Number of days to forecast (7 or 30)
 
-            # Confidence intervals (wider as we go further out)
-            uncertainty = 0.1 + (day * 0.02)
-            confidence_lower.append(max(0, daily_pred * (1 - uncertainty)))
-            confidence_upper.append(daily_pred * (1 + uncertainty))
+        Returns:
+            DemandForecast per product, in input order
+        """
+        if not features_list:
+            return []
+
+        if self.model is None:
+            return [
+                self._heuristic_prediction(features, horizon_days)
+                for features in features_list
+            ]
+
+        X = self.feature_engineer.features_list_to_matrix(features_list)
+        base_predictions = self.model.predict(X, num_threads=self.num_threads)
+
+        return self._build_forecasts(features_list, base_predictions, horizon_days)
+
+    def _build_forecasts(
+        self,
+        features_list: list[ProductFeatures],
+        base_predictions: np.ndarray,
+        horizon_days: int,
+    ) -> list[DemandForecast]:
+        """Expand per-product base predictions into daily forecasts."""
+        days = np.arange(horizon_days)
+        day_of_week = np.fromiter(
+            (f.day_of_week for f in features_list), dtype=np.int64, count=len(features_list)
+        )
+
+        # Adjust for day of week seasonality; rows are products, columns days
+        adjusted_days = (day_of_week[:, None] + days) % 7
+        weekend_factor = np.where(adjusted_days >= 5, 1.2, 1.0)
+
+        daily_pred = np.asarray(base_predictions, dtype=np.float64)[:, None] * weekend_factor
+        predictions = np.maximum(0, daily_pred)
+
+        # Confidence intervals (wider as we go further out)
+        uncertainty = 0.1 + (days * 0.02)
+        confidence_lower = np.maximum(0, daily_pred * (1 - uncertainty))
+        confidence_upper = daily_pred * (1 + uncertainty)
+
+        # Determine trend for every product at once
+        if horizon_days >= 3:
+            early_avg = predictions[:, :3].mean(axis=1)
+            late_avg = predictions[:, -3:].mean(axis=1)
+            increasing = (late_avg > early_avg * 1.1).tolist()
+            decreasing = (late_avg < early_avg * 0.9).tolist()
+        else:
+            increasing = decreasing = [False] * len(features_list)
 
-        # Determine trend
-        if len(predictions) >= 3:
-            early_avg = np.mean(predictions[:3])
-            late_avg = np.mean(predictions[-3:])
-            if late_avg > early_avg * 1.1:
+        # Find peak day
+        peak_days = (predictions.argmax(axis=1) % 7).tolist()
+        totals = predictions.sum(axis=1).tolist()
+
+        # One conversion per matrix rather than per row
+        predictions_rows = predictions.tolist()
+        lower_rows = confidence_lower.tolist()
+        upper_rows = confidence_upper.tolist()
+
+        forecast_date = date.today()
+        forecasts = []
+        for i, features in enumerate(features_list):
+            if increasing[i]:
                 trend = "increasing"
-            elif late_avg < early_avg * 0.9:
+            elif decreasing[i]:
                 trend = "decreasing"
             else:
                 trend = "stable"
-        else:
-            trend = "stable"
 
-        # Find peak day
-        peak_day = int(np.argmax(predictions) % 7)
-
-        return DemandForecast(
-            product_id=features.product_id,
-            forecast_date=date.today(),
-            horizon_days=horizon_days,
-            predicted_daily_sales=predictions,
-            predicted_total_sales=sum(predictions),
-            confidence_lower=confidence_lower,
-            confidence_upper=confidence_upper,
-            trend=trend,
-            seasonality_detected=features.is_weekend or abs(features.price_trend_7d) > 0.5,
-            peak_day=peak_day,
-            confidence_score=self._calculate_confidence(features),
-        )
+            row = predictions_rows[i]
+            forecasts.append(DemandForecast(
+                product_id=features.product_id,
+                forecast_date=forecast_date,
+                horizon_days=horizon_days,
+                predicted_daily_sales=row,
+                predicted_total_sales=totals[i],
+                confidence_lower=lower_rows[i],
+                confidence_upper=upper_rows[i],
+                trend=trend,
+                seasonality_detected=features.is_weekend or abs(features.price_trend_7d) > 0.5,
+                peak_day=peak_days[i],
+                confidence_score=self._calculate_confidence(features),
+            ))
+
+        return forecasts
 
     def evaluate(self, X: np.ndarray, y: np.ndarray) -> ModelMetrics:
         """Evaluate model on test data."""
         if self.model is None:
             return ModelMetrics(mae=0, mape=0, rmse=0, r2=0)
 
-        predictions = self.model.predict(X)
+        predictions = self.model.predict(X, num_threads=self.num_threads)
+
+        # Residuals computed once and reused; dot products give the sums of
+        # squares without materialising squared temporaries
+        errors = predictions - y
+        abs_errors = np.abs(errors)
+        ss_res = float(np.dot(errors, errors))
 
-        mae = float(np.mean(np.abs(predictions - y)))
-        mape = float(np.mean(np.abs((predictions - y) / (y + 1e-8))) * 100)
-        rmse = float(np.sqrt(np.mean((predictions - y) ** 2)))
+        mae = float(abs_errors.mean())
+        mape = float((abs_errors / np.abs(y + 1e-8)).mean() * 100)
+        rmse = float(np.sqrt(ss_res / len(y)))
 
-        ss_res = np.sum((y - predictions) ** 2)
-        ss_tot = np.sum((y - np.mean(y)) ** 2)
+        deviations = y - y.mean()
+        ss_tot = float(np.dot(deviations, deviations))
         r2 = float(1 - (ss_res / (ss_tot + 1e-8)))
 
         return ModelMetrics(mae=mae, mape=mape, rmse=rmse, r2=r2)
@@ -234,25 +394,20 @@ class DemandForecaster:
             elif features.current_rank > 100000:
                 base_daily_sales *= 0.5
 
-        predictions = []
-        confidence_lower = []
-        confidence_upper = []
-
-        for day in range(horizon_days):
-            adjusted_day = (features.day_of_week + day) % 7
-            weekend_factor = 1.15 if adjusted_day >= 5 else 1.0
-            daily_pred = max(1, base_daily_sales * weekend_factor)
+        adjusted_days = (features.day_of_week + np.arange(horizon_days)) % 7
+        weekend_factor = np.where(adjusted_days >= 5, 1.15, 1.0)
+        daily_pred = np.maximum(1, base_daily_sales * weekend_factor)
 
-            predictions.append(daily_pred)
-            confidence_lower.append(daily_pred * 0.6)
-            confidence_upper.append(daily_pred * 1.5)
+        predictions = daily_pred.tolist()
+        confidence_lower = (daily_pred * 0.6).tolist()
+        confidence_upper = (daily_pred * 1.5).tolist()
 
         return DemandForecast(
             product_id=features.product_id,
             forecast_date=date.today(),
             horizon_days=horizon_days,
             predicted_daily_sales=predictions,
-            predicted_total_sales=sum(predictions),
+            predicted_total_sales=float(daily_pred.sum()),
             confidence_lower=confidence_lower,
             confidence_upper=confidence_upper,
             trend="stable",
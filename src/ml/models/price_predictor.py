@@ -6,7 +6,7 @@ from decimal import Decimal
 from typing import Optional
 import numpy as np
 
-from src.ml.features import FeatureEngineer, ProductFeatures
+from src.ml.features import DEFAULT_FEATURE_ENGINEER, FeatureEngineer, ProductFeatures
 
 
 @dataclass
@@ -55,8 +55,8 @@ class PricePredictor:
     identify optimal buying windows.
     """
 
-    def __init__(self):
-        self.feature_engineer = FeatureEngineer()
+    def __init__(self, feature_engineer: FeatureEngineer | None = None):
+        self.feature_engineer = feature_engineer or DEFAULT_FEATURE_ENGINEER
 
     def predict_price_trajectory(
         self,
@@ -85,44 +85,40 @@ class PricePredictor:
         else:
             volatility_class = "high"
 
-        # Generate price predictions
-        predictions = []
-        confidence_lower = []
-        confidence_upper = []
+        # Generate price predictions for all days at once
+        days = np.arange(horizon_days)
 
-        for day in range(horizon_days):
-            # Base trend extrapolation
-            trend_effect = price_trend * day
+        # Base trend extrapolation
+        trend_effect = price_trend * days
 
-            # Reversion to mean
-            mean_reversion = (features.price_mean_7d - current_price) * 0.05 * day
+        # Reversion to mean
+        mean_reversion = (features.price_mean_7d - current_price) * 0.05 * days
 
-            # Seasonality (month-end discounts)
-            future_day = (features.day_of_month + day) % 30
-            if future_day >= 25 or future_day <= 5:
-                seasonality = -current_price * 0.05  # 5% month-end discount
-            else:
-                seasonality = 0
-
-            predicted_price = current_price + trend_effect + mean_reversion + seasonality
-            predicted_price = max(features.price_min_30d * 0.9, predicted_price)  # Floor
+        # Seasonality (month-end discounts)
+        future_days = (features.day_of_month + days) % 30
+        seasonality = np.where(
+            (future_days >= 25) | (future_days <= 5),
+            -current_price * 0.05,  # 5% month-end discount
+            0.0,
+        )
 
-            predictions.append(predicted_price)
+        predicted_prices = current_price + trend_effect + mean_reversion + seasonality
+        predicted_prices = np.maximum(features.price_min_30d * 0.9, predicted_prices)  # Floor
 
-            # Confidence intervals widen over time
-            uncertainty = price_volatility * np.sqrt(day + 1) * current_price
-            confidence_lower.append(max(0, predicted_price - uncertainty * 1.96))
-            confidence_upper.append(predicted_price + uncertainty * 1.96)
+        # Confidence intervals widen over time
+        uncertainty = price_volatility * np.sqrt(days + 1) * current_price
+        confidence_lower = np.maximum(0, predicted_prices - uncertainty * 1.96)
+        confidence_upper = predicted_prices + uncertainty * 1.96
 
         # Calculate expected change
-        expected_change = ((predictions[-1] - current_price) / current_price) * 100
+        expected_change = ((float(predicted_prices[-1]) - current_price) / current_price) * 100
 
         # Probability of price drop
-        drops = sum(1 for p in predictions if p < current_price * 0.95)
+        drops = int(np.count_nonzero(predicted_prices < current_price * 0.95))
         prob_drop = drops / horizon_days
 
         # Find optimal buy window (lowest predicted prices)
-        min_idx = int(np.argmin(predictions))
+        min_idx = int(predicted_prices.argmin())
         window_start = max(0, min_idx - 2)
         window_end = min(horizon_days - 1, min_idx + 2)
 
@@ -140,9 +136,9 @@ class PricePredictor:
             horizon_days=horizon_days,
             current_price=current_price,
             current_discount=features.discount_frequency * 100,
-            predicted_prices=predictions,
-            confidence_lower=confidence_lower,
-            confidence_upper=confidence_upper,
+            predicted_prices=predicted_prices.tolist(),
+            confidence_lower=confidence_lower.tolist(),
+            confidence_upper=confidence_upper.tolist(),
             expected_price_change=expected_change,
             probability_price_drop=prob_drop,
             optimal_buy_window=(window_start, window_end),
@@ -221,12 +217,16 @@ class PricePredictor:
 
     def detect_price_war(
         self,
-        price_history: list[float],
-        seller_count_history: list[int],
+        price_history: list[float] | np.ndarray,
+        seller_count_history: list[int] | np.ndarray,
     ) -> PriceWarAlert:
         """
         Detect if a price war is occurring.
 
+        Lists and ndarrays are both accepted. The 7-day windows are scored as
+        plain Python numbers either way; an ndarray history only pays off for
+        the full-history minimum.
+
         Args:
             price_history: Recent price history (newest first)
             seller_count_history: Seller count history (same order)
@@ -240,20 +240,21 @@ class PricePredictor:
                 severity="none",
                 competitors_involved=0,
                 price_drop_velocity=0,
-                estimated_floor_price=price_history[0] if price_history else 0,
+                estimated_floor_price=float(price_history[0]) if len(price_history) else 0,
                 recommendation="Insufficient data for analysis",
             )
 
-        # Calculate price drop velocity
-        recent_prices = price_history[:7]
+        # Calculate price drop velocity. Kept in plain Python: for six ratios,
+        # np.asarray plus the ufunc passes costs ~3x more than the list-comp.
+        recent_prices = self._window(price_history)
         price_changes = [
             (recent_prices[i] - recent_prices[i + 1]) / recent_prices[i + 1] * 100
             for i in range(len(recent_prices) - 1)
         ]
-        avg_daily_drop = np.mean(price_changes)
+        avg_daily_drop = sum(price_changes) / len(price_changes)
 
         # Check seller count changes
-        recent_sellers = seller_count_history[:7]
+        recent_sellers = self._window(seller_count_history)
         seller_increase = recent_sellers[0] - recent_sellers[-1] if len(recent_sellers) > 1 else 0
 
         # Determine if price war
@@ -270,7 +271,10 @@ class PricePredictor:
             severity = "none"
 
         # Estimate floor price
-        min_observed = min(price_history)
+        if isinstance(price_history, np.ndarray):
+            min_observed = float(price_history.min())
+        else:
+            min_observed = min(price_history)
         estimated_floor = min_observed * 0.95
 
         # Generate recommendation
@@ -292,6 +296,12 @@ class PricePredictor:
             recommendation=recommendation,
         )
 
+    @staticmethod
+    def _window(history: list | np.ndarray, days: int = 7) -> list:
+        """Newest `days` values of a history as a plain list."""
+        window = history[:days]
+        return window.tolist() if isinstance(window, np.ndarray) else window
+
     def _generate_recommendation(
         self,
         expected_change: float,
@@ -2,17 +2,28 @@
 
 import re
 import logging
+import time
 from dataclasses import dataclass
 from decimal import Decimal
 
-from playwright.async_api import Page
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 
-from .base import BaseScraper, ScrapedProduct, ScrapedMetrics
+from .base import EXTRACT_FIELDS_JS, BaseScraper, ScrapedProduct, ScrapedMetrics
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; these run for every scraped product
+_PRODUCT_ID_PATTERNS = [
+    re.compile(r"/item/(\d+)\.html"),                    # AliExpress
+    re.compile(r"/product-detail/[^/]+_(\d+)\.html"),    # Alibaba
+    re.compile(r"productId=(\d+)"),                      # Query param
+    re.compile(r"/(\d+)\.html"),                         # Generic
+]
+_PRICE_RE = re.compile(r'[\$¥]?([\d,]+\.?\d*)')
+_INT_RE = re.compile(r'([\d,]+)')
 
-@dataclass
+
+@dataclass(slots=True)
 class AlibabaProduct(ScrapedProduct):
     """Alibaba-specific product data."""
     alibaba_id: str | None = None
@@ -41,16 +52,57 @@ class AlibabaScraper(BaseScraper):
         "Jewelry": "/category/100003100",
     }
 
+    # Products scraped within PRODUCT_CACHE_TTL seconds are reused instead of
+    # navigating again, e.g. when category and bestseller crawls overlap
+    PRODUCT_CACHE_TTL = 300
+    PRODUCT_CACHE_MAXSIZE = 4096
+
+    # Field specs for EXTRACT_FIELDS_JS; text selectors are tried in order
+    ALIEXPRESS_SELECTORS = {
+        "text": {
+            "title": ['h1[data-pl="product-title"]', '.product-title-text'],
+            "price": ['[data-pl="product-price"]', '.product-price-value'],
+            "rating": ['.overview-rating-average'],
+            "reviews": ['[data-pl="review-count"]'],
+            "orders": ['[data-pl="sold-count"]'],
+            "store_name": ['.store-name'],
+        },
+        "attrs": {
+            "image": ['.magnifier-image img', 'src'],
+        },
+    }
+
+    ALIBABA_SELECTORS = {
+        "text": {
+            "title": ['.module-pdp-title h1', '.ma-title'],
+            "price": ['.module-pdp-price'],
+            "moq": ['.module-pdp-moq'],
+            "supplier": ['.company-name'],
+            "location": ['.company-location'],
+        },
+        "attrs": {
+            "image": ['.main-image img', 'src'],
+        },
+        "exists": {
+            "trade_assurance": '.trade-assurance-icon',
+        },
+    }
+
+    # Any product title means the client-rendered page is ready to extract
+    READY_SELECTOR = ", ".join(
+        ALIEXPRESS_SELECTORS["text"]["title"] + ALIBABA_SELECTORS["text"]["title"]
+    )
+
+    def __init__(self):
+        super().__init__()
+        # (platform, product_id) -> (scraped_at, product), least recently used first.
+        # Only touched between awaits, so the event loop serializes access.
+        self._product_cache: dict[tuple[str, str], tuple[float, AlibabaProduct]] = {}
+
     def extract_product_id(self, url: str) -> str | None:
         """Extract product ID from Alibaba/AliExpress URL."""
-        patterns = [
-            r"/item/(\d+)\.html",           # AliExpress
-            r"/product-detail/[^/]+_(\d+)\.html",  # Alibaba
-            r"productId=(\d+)",             # Query param
-            r"/(\d+)\.html",                # Generic
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _PRODUCT_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         return None
@@ -59,19 +111,40 @@ class AlibabaScraper(BaseScraper):
         """Check if URL is AliExpress or Alibaba."""
         return "aliexpress" in url.lower()
 
-    async def scrape_product(self, url: str, page: Page) -> AlibabaProduct | None:
-        """Scrape Alibaba/AliExpress product page."""
+    async def scrape_product(self, url: str, page: Page | None = None) -> AlibabaProduct | None:
+        """Scrape Alibaba/AliExpress product page, on a pooled page unless one is given."""
         try:
             is_aliexpress = self.is_aliexpress(url)
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_timeout(3000)
-
             product_id = self.extract_product_id(url)
 
+            cache_key = None
+            if product_id:
+                cache_key = ("aliexpress" if is_aliexpress else "alibaba", product_id)
+                cached = self._get_cached_product(cache_key)
+                if cached is not None:
+                    return cached
+
+            if page is None:
+                # Only take a pooled page once the cache has missed
+                async with self._page() as page:
+                    return await self.scrape_product(url, page)
+
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            # Wait for the title to render rather than a fixed 3s; extraction
+            # still runs on timeout and falls back to defaults as before
+            try:
+                await page.wait_for_selector(self.READY_SELECTOR, timeout=3000)
+            except PlaywrightTimeout:
+                pass
+
             if is_aliexpress:
-                return await self._scrape_aliexpress(url, page, product_id)
+                product = await self._scrape_aliexpress(url, page, product_id)
             else:
-                return await self._scrape_alibaba(url, page, product_id)
+                product = await self._scrape_alibaba(url, page, product_id)
+
+            if product is not None and cache_key is not None:
+                self._cache_product(cache_key, product)
+            return product
 
         except Exception as e:
             logger.error(f"Error scraping Alibaba product {url}: {e}")
@@ -79,40 +152,38 @@ class AlibabaScraper(BaseScraper):
 
     async def _scrape_aliexpress(self, url: str, page: Page, product_id: str | None) -> AlibabaProduct | None:
         """Scrape AliExpress product."""
-        title = await self._safe_text(page, 'h1[data-pl="product-title"]')
-        if not title:
-            title = await self._safe_text(page, '.product-title-text')
+        fields = await page.evaluate(EXTRACT_FIELDS_JS, self.ALIEXPRESS_SELECTORS)
+        title = fields["title"]
 
         # Price
-        price_text = await self._safe_text(page, '[data-pl="product-price"]')
-        if not price_text:
-            price_text = await self._safe_text(page, '.product-price-value')
-        price = self._parse_price(price_text)
+        price = self._parse_price(fields["price"])
 
         # Rating
-        rating_text = await self._safe_text(page, '.overview-rating-average')
+        rating_text = fields["rating"]
         rating = float(rating_text) if rating_text else 0.0
 
         # Reviews
-        reviews_text = await self._safe_text(page, '[data-pl="review-count"]')
-        reviews = self._parse_int(reviews_text)
+        reviews = self._parse_int(fields["reviews"])
 
         # Orders (as proxy for demand)
-        orders_text = await self._safe_text(page, '[data-pl="sold-count"]')
-        orders = self._parse_int(orders_text)
+        orders = self._parse_int(fields["orders"])
 
         # Store name
-        store_name = await self._safe_text(page, '.store-name')
+        store_name = fields["store_name"]
 
         # Image
-        image_url = await self._safe_attr(page, '.magnifier-image img', 'src')
+        image_url = fields["image"]
 
         return AlibabaProduct(
             platform=self.PLATFORM,
+            asin=product_id or "",
             product_id=product_id or "",
             url=url,
             title=title or "Unknown Product",
             price=price or Decimal("0"),
+            original_price=None,
+            discount_percent=None,
+            rank=None,
             rating=rating,
             reviews=reviews + orders,  # Combine for demand signal
             brand=None,
@@ -120,6 +191,8 @@ class AlibabaScraper(BaseScraper):
             image_url=image_url,
             in_stock=True,
             seller_count=1,
+            delivery_days=None,
+            buybox_owner=store_name,
             alibaba_id=product_id,
             min_order_qty=1,
             is_aliexpress=True,
@@ -128,34 +201,35 @@ class AlibabaScraper(BaseScraper):
 
     async def _scrape_alibaba(self, url: str, page: Page, product_id: str | None) -> AlibabaProduct | None:
         """Scrape Alibaba B2B product."""
-        title = await self._safe_text(page, '.module-pdp-title h1')
-        if not title:
-            title = await self._safe_text(page, '.ma-title')
+        fields = await page.evaluate(EXTRACT_FIELDS_JS, self.ALIBABA_SELECTORS)
+        title = fields["title"]
 
         # Price range
-        price_text = await self._safe_text(page, '.module-pdp-price')
-        price = self._parse_price(price_text)
+        price = self._parse_price(fields["price"])
 
         # MOQ
-        moq_text = await self._safe_text(page, '.module-pdp-moq')
-        moq = self._parse_int(moq_text) or 1
+        moq = self._parse_int(fields["moq"]) or 1
 
         # Supplier
-        supplier = await self._safe_text(page, '.company-name')
-        location = await self._safe_text(page, '.company-location')
+        supplier = fields["supplier"]
+        location = fields["location"]
 
         # Trade assurance
-        trade_assurance = await page.query_selector('.trade-assurance-icon') is not None
+        trade_assurance = fields["trade_assurance"]
 
         # Image
-        image_url = await self._safe_attr(page, '.main-image img', 'src')
+        image_url = fields["image"]
 
         return AlibabaProduct(
             platform=self.PLATFORM,
+            asin=product_id or "",
             product_id=product_id or "",
             url=url,
             title=title or "Unknown Product",
             price=price or Decimal("0"),
+            original_price=None,
+            discount_percent=None,
+            rank=None,
             rating=0.0,  # B2B doesn't show ratings typically
             reviews=0,
             brand=None,
@@ -163,6 +237,8 @@ class AlibabaScraper(BaseScraper):
             image_url=image_url,
             in_stock=True,
             seller_count=1,
+            delivery_days=None,
+            buybox_owner=supplier,
             alibaba_id=product_id,
             min_order_qty=moq,
             is_aliexpress=False,
@@ -171,9 +247,16 @@ class AlibabaScraper(BaseScraper):
             trade_assurance=trade_assurance,
         )
 
-    async def scrape_metrics(self, url: str, page: Page) -> ScrapedMetrics | None:
-        """Scrape metrics from Alibaba product."""
-        product = await self.scrape_product(url, page)
+    async def scrape_metrics(
+        self, url: str, page: Page, product: AlibabaProduct | None = None
+    ) -> ScrapedMetrics | None:
+        """Scrape metrics from Alibaba product.
+
+        Pass a product already returned by scrape_product to build the
+        metrics from it instead of scraping the page again.
+        """
+        if product is None:
+            product = await self.scrape_product(url, page)
         if not product:
             return None
 
@@ -190,32 +273,30 @@ class AlibabaScraper(BaseScraper):
             buybox_owner=product.supplier_name,
         )
 
-    async def _safe_text(self, page: Page, selector: str) -> str | None:
-        """Safely get text from selector."""
-        try:
-            elem = await page.query_selector(selector)
-            if elem:
-                return (await elem.inner_text()).strip()
-        except Exception:
-            pass
-        return None
+    def _get_cached_product(self, key: tuple[str, str]) -> AlibabaProduct | None:
+        """Return a cached product if it is still fresh, marking it recently used."""
+        entry = self._product_cache.pop(key, None)
+        if entry is None:
+            return None
+        scraped_at, product = entry
+        if time.monotonic() - scraped_at > self.PRODUCT_CACHE_TTL:
+            return None
+        self._product_cache[key] = entry
+        return product
 
-    async def _safe_attr(self, page: Page, selector: str, attr: str) -> str | None:
-        """Safely get attribute from selector."""
-        try:
-            elem = await page.query_selector(selector)
-            if elem:
-                return await elem.get_attribute(attr)
-        except Exception:
-            pass
-        return None
+    def _cache_product(self, key: tuple[str, str], product: AlibabaProduct) -> None:
+        """Cache a scraped product, evicting the least recently used past maxsize."""
+        self._product_cache.pop(key, None)
+        self._product_cache[key] = (time.monotonic(), product)
+        if len(self._product_cache) > self.PRODUCT_CACHE_MAXSIZE:
+            del self._product_cache[next(iter(self._product_cache))]
 
     def _parse_price(self, text: str | None) -> Decimal | None:
         """Parse price from text (handles $ and ¥)."""
         if not text:
             return None
         # Remove currency symbols and get first number
-        match = re.search(r'[\$¥]?([\d,]+\.?\d*)', text.replace(',', ''))
+        match = _PRICE_RE.search(text.replace(',', ''))
         if match:
             return Decimal(match.group(1))
         return None
@@ -224,7 +305,7 @@ class AlibabaScraper(BaseScraper):
         """Parse integer from text."""
         if not text:
             return 0
-        match = re.search(r'([\d,]+)', text.replace(',', ''))
+        match = _INT_RE.search(text.replace(',', ''))
         if match:
             return int(match.group(1))
         return 0
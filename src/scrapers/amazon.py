@@ -7,21 +7,72 @@ from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 
 from .base import BaseScraper, ScrapedProduct
 
+# Compiled once; these run for every scraped product
+_ASIN_PATTERNS = [
+    re.compile(r"/dp/([A-Z0-9]{10})", re.IGNORECASE),
+    re.compile(r"/gp/product/([A-Z0-9]{10})", re.IGNORECASE),
+    re.compile(r"asin=([A-Z0-9]{10})", re.IGNORECASE),
+]
+_PRICE_RE = re.compile(r"[\d,]+\.?\d*")
+_RATING_RE = re.compile(r"(\d+\.?\d*)")
+_REVIEWS_RE = re.compile(r"([\d,]+)")
+_RANK_RE = re.compile(r"#?([\d,]+)")
+_BRAND_NOISE_RE = re.compile(r"(Visit the|Store|Brand:)\s*")
+_SELLER_COUNT_RE = re.compile(r"(\d+)")
+
+# Reads every product-page field in one page.evaluate round-trip instead of a
+# query_selector/text_content pair per field. Rank rows are matched on their
+# label text here because Playwright's :text() pseudo-class isn't valid CSS.
+_EXTRACT_PRODUCT_JS = """
+(sel) => {
+    const text = (s) => document.querySelector(s)?.textContent ?? null;
+    const labelled = (s, label) => {
+        const el = [...document.querySelectorAll(s)].find((e) => e.textContent.includes(label));
+        return el ? el.textContent : null;
+    };
+    const fields = {};
+    for (const [name, s] of Object.entries(sel)) {
+        fields[name] = text(s);
+    }
+    fields.rank = labelled(sel.rank, "Best Sellers Rank");
+    fields.rank_alt = labelled(sel.rank_alt, "Best Sellers Rank");
+    fields.image = document.querySelector(sel.image)?.getAttribute("src") ?? null;
+    return fields;
+}
+"""
+
+# Block/CAPTCHA check run in-page so only a boolean crosses CDP, not the DOM
+_IS_BLOCKED_JS = """
+(phrases) => {
+    if (document.querySelector("form[action*='validateCaptcha']")) return true;
+    const text = document.body?.textContent ?? "";
+    return phrases.some((phrase) => text.includes(phrase));
+}
+"""
+
+# Collects the first `limit` matching link hrefs, de-duplicated in-page, in one
+# round-trip instead of a get_attribute call per link
+_EXTRACT_LINKS_JS = """
+([selector, limit]) => [...new Set(
+    Array.from(document.querySelectorAll(selector)).slice(0, limit).map((a) => a.href)
+)]
+"""
+
 
 class AmazonScraper(BaseScraper):
     """Scraper for Amazon US product pages."""
 
     BASE_URL = "https://www.amazon.com"
 
-    # Selectors for product page
+    # Selectors for product page (plain CSS, evaluated in-page by _EXTRACT_PRODUCT_JS)
     SELECTORS = {
         "title": "#productTitle",
         "price": "span.a-price span.a-offscreen",
         "original_price": "span.a-price.a-text-price span.a-offscreen",
         "rating": "#acrPopover span.a-size-base",
         "reviews": "#acrCustomerReviewText",
-        "rank": "#productDetails_detailBullets_sections1 tr:has(th:text('Best Sellers Rank')) td",
-        "rank_alt": "#detailBullets_feature_div li:has(span:text('Best Sellers Rank'))",
+        "rank": "#productDetails_detailBullets_sections1 tr",
+        "rank_alt": "#detailBullets_feature_div li",
         "category": "#wayfinding-breadcrumbs_feature_div ul li:last-child a",
         "brand": "#bylineInfo",
         "image": "#landingImage",
@@ -49,29 +100,31 @@ class AmazonScraper(BaseScraper):
             if not asin:
                 return None
 
-            title = await self._get_text(page, self.SELECTORS["title"])
+            fields = await page.evaluate(_EXTRACT_PRODUCT_JS, self.SELECTORS)
+
+            title = fields["title"]
             if not title:
                 print(f"Could not find title for {url}")
                 return None
 
-            price = await self._get_price(page, self.SELECTORS["price"])
-            original_price = await self._get_price(page, self.SELECTORS["original_price"])
+            price = self._parse_price(fields["price"])
+            original_price = self._parse_price(fields["original_price"])
 
             # Calculate discount
             discount_percent = None
             if original_price and price and original_price > price:
                 discount_percent = float((original_price - price) / original_price * 100)
 
-            rating = await self._get_rating(page)
-            reviews = await self._get_reviews(page)
-            rank = await self._get_rank(page)
-            category = await self._get_text(page, self.SELECTORS["category"]) or "Unknown"
-            brand = await self._get_brand(page)
-            image_url = await self._get_attribute(page, self.SELECTORS["image"], "src")
-            in_stock = await self._check_availability(page)
-            seller_count = await self._get_seller_count(page)
-            buybox_owner = await self._get_text(page, self.SELECTORS["buybox_seller"])
-            delivery_days = await self._get_delivery_days(page)
+            rating = self._parse_rating(fields["rating"])
+            reviews = self._parse_reviews(fields["reviews"])
+            rank = self._parse_rank(fields["rank"]) or self._parse_rank(fields["rank_alt"])
+            category = fields["category"] or "Unknown"
+            brand = self._parse_brand(fields["brand"])
+            image_url = fields["image"]
+            in_stock = self._parse_availability(fields["availability"])
+            seller_count = self._parse_seller_count(fields["seller_count"])
+            buybox_owner = fields["buybox_seller"]
+            delivery_days = self._parse_delivery_days(fields["delivery"])
 
             return ScrapedProduct(
                 asin=asin,
@@ -98,7 +151,7 @@ class AmazonScraper(BaseScraper):
             print(f"Error scraping {url}: {e}")
             return None
         finally:
-            await page.context.close()
+            await self._release_page(page)
 
     async def scrape_category_page(self, category: str, page_num: int = 1) -> list[str]:
         """Scrape product URLs from a category search page."""
@@ -113,23 +166,23 @@ class AmazonScraper(BaseScraper):
             if await self._is_blocked(page):
                 return urls
 
-            # Find all product links
-            links = await page.query_selector_all("div[data-asin] a.a-link-normal[href*='/dp/']")
+            # Find all product links (limit to 50 per page)
+            hrefs = await page.evaluate(
+                _EXTRACT_LINKS_JS, ["div[data-asin] a.a-link-normal[href*='/dp/']", 50]
+            )
 
-            for link in links[:50]:  # Limit to 50 per page
-                href = await link.get_attribute("href")
-                if href and "/dp/" in href:
-                    asin = self._extract_asin(href)
-                    if asin:
-                        urls.append(f"{self.BASE_URL}/dp/{asin}")
+            for href in hrefs:
+                asin = self._extract_asin(href)
+                if asin:
+                    urls.append(f"{self.BASE_URL}/dp/{asin}")
 
-            # Deduplicate
-            urls = list(set(urls))
+            # Deduplicate, keeping page order
+            urls = list(dict.fromkeys(urls))
 
         except Exception as e:
             print(f"Error scraping category {category}: {e}")
         finally:
-            await page.context.close()
+            await self._release_page(page)
 
         return urls
 
@@ -163,22 +216,20 @@ class AmazonScraper(BaseScraper):
             if await self._is_blocked(page):
                 return urls
 
-            # Find product links
-            links = await page.query_selector_all("a[href*='/dp/']")
+            # Find product links (top 100 bestsellers)
+            hrefs = await page.evaluate(_EXTRACT_LINKS_JS, ["a[href*='/dp/']", 100])
 
-            for link in links[:100]:  # Top 100 bestsellers
-                href = await link.get_attribute("href")
-                if href and "/dp/" in href:
-                    asin = self._extract_asin(href)
-                    if asin:
-                        urls.append(f"{self.BASE_URL}/dp/{asin}")
+            for href in hrefs:
+                asin = self._extract_asin(href)
+                if asin:
+                    urls.append(f"{self.BASE_URL}/dp/{asin}")
 
-            urls = list(set(urls))
+            urls = list(dict.fromkeys(urls))
 
         except Exception as e:
             print(f"Error scraping bestsellers {category}: {e}")
         finally:
-            await page.context.close()
+            await self._release_page(page)
 
         return urls
 
@@ -186,53 +237,26 @@ class AmazonScraper(BaseScraper):
 
     def _extract_asin(self, url_or_text: str) -> str | None:
         """Extract ASIN from URL or text."""
-        patterns = [
-            r"/dp/([A-Z0-9]{10})",
-            r"/gp/product/([A-Z0-9]{10})",
-            r"asin=([A-Z0-9]{10})",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url_or_text, re.IGNORECASE)
+        for pattern in _ASIN_PATTERNS:
+            match = pattern.search(url_or_text)
             if match:
                 return match.group(1).upper()
         return None
 
     async def _is_blocked(self, page: Page) -> bool:
         """Check if we hit a CAPTCHA or block page."""
-        content = await page.content()
         blocked_indicators = [
             "Enter the characters you see below",
             "Sorry, we just need to make sure you're not a robot",
             "Type the characters you see in this image",
         ]
-        return any(indicator in content for indicator in blocked_indicators)
-
-    async def _get_text(self, page: Page, selector: str) -> str | None:
-        """Get text content of an element."""
-        try:
-            element = await page.query_selector(selector)
-            if element:
-                return await element.text_content()
-        except Exception:
-            pass
-        return None
-
-    async def _get_attribute(self, page: Page, selector: str, attr: str) -> str | None:
-        """Get attribute value of an element."""
-        try:
-            element = await page.query_selector(selector)
-            if element:
-                return await element.get_attribute(attr)
-        except Exception:
-            pass
-        return None
+        return await page.evaluate(_IS_BLOCKED_JS, blocked_indicators)
 
-    async def _get_price(self, page: Page, selector: str) -> Decimal | None:
-        """Extract price from element."""
-        text = await self._get_text(page, selector)
+    def _parse_price(self, text: str | None) -> Decimal | None:
+        """Extract price from element text."""
         if text:
             # Extract numbers from price string like "$29.99"
-            match = re.search(r"[\d,]+\.?\d*", text.replace(",", ""))
+            match = _PRICE_RE.search(text.replace(",", ""))
             if match:
                 try:
                     return Decimal(match.group())
@@ -240,63 +264,55 @@ class AmazonScraper(BaseScraper):
                     pass
         return None
 
-    async def _get_rating(self, page: Page) -> float:
+    def _parse_rating(self, text: str | None) -> float:
         """Extract product rating."""
-        text = await self._get_text(page, self.SELECTORS["rating"])
         if text:
-            match = re.search(r"(\d+\.?\d*)", text)
+            match = _RATING_RE.search(text)
             if match:
                 return float(match.group(1))
         return 0.0
 
-    async def _get_reviews(self, page: Page) -> int:
+    def _parse_reviews(self, text: str | None) -> int:
         """Extract review count."""
-        text = await self._get_text(page, self.SELECTORS["reviews"])
         if text:
-            match = re.search(r"([\d,]+)", text.replace(",", ""))
+            match = _REVIEWS_RE.search(text.replace(",", ""))
             if match:
                 return int(match.group(1).replace(",", ""))
         return 0
 
-    async def _get_rank(self, page: Page) -> int | None:
+    def _parse_rank(self, text: str | None) -> int | None:
         """Extract bestseller rank."""
-        for selector in [self.SELECTORS["rank"], self.SELECTORS["rank_alt"]]:
-            text = await self._get_text(page, selector)
-            if text:
-                match = re.search(r"#?([\d,]+)", text.replace(",", ""))
-                if match:
-                    return int(match.group(1).replace(",", ""))
+        if text:
+            match = _RANK_RE.search(text.replace(",", ""))
+            if match:
+                return int(match.group(1).replace(",", ""))
         return None
 
-    async def _get_brand(self, page: Page) -> str | None:
+    def _parse_brand(self, text: str | None) -> str | None:
         """Extract brand name."""
-        text = await self._get_text(page, self.SELECTORS["brand"])
         if text:
             # Clean up "Visit the X Store" or "Brand: X"
-            text = re.sub(r"(Visit the|Store|Brand:)\s*", "", text)
+            text = _BRAND_NOISE_RE.sub("", text)
             return text.strip()
         return None
 
-    async def _check_availability(self, page: Page) -> bool:
+    def _parse_availability(self, text: str | None) -> bool:
         """Check if product is in stock."""
-        text = await self._get_text(page, self.SELECTORS["availability"])
         if text:
             out_of_stock_phrases = ["out of stock", "unavailable", "currently unavailable"]
             return not any(phrase in text.lower() for phrase in out_of_stock_phrases)
         return True  # Assume in stock if can't determine
 
-    async def _get_seller_count(self, page: Page) -> int:
+    def _parse_seller_count(self, text: str | None) -> int:
         """Get number of sellers offering this product."""
-        text = await self._get_text(page, self.SELECTORS["seller_count"])
         if text:
-            match = re.search(r"(\d+)", text)
+            match = _SELLER_COUNT_RE.search(text)
             if match:
                 return int(match.group(1))
         return 1
 
-    async def _get_delivery_days(self, page: Page) -> int | None:
+    def _parse_delivery_days(self, text: str | None) -> int | None:
         """Extract estimated delivery days."""
-        text = await self._get_text(page, self.SELECTORS["delivery"])
         if text:
             # Look for patterns like "arrives Thu, Jan 25" or "tomorrow"
             if "tomorrow" in text.lower():
@@ -3,18 +3,144 @@
 import asyncio
 import random
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+import lxml.html
+from playwright.async_api import (
+    async_playwright, Page, Browser, BrowserContext, Playwright, Request, Route
+)
 
 from src.config import settings
-from src.scrapers.proxy_manager import proxy_manager, rate_limiter, circuit_breaker
+from src.scrapers.proxy_manager import get_proxy_manager, rate_limiter, circuit_breaker
 
 
-@dataclass
+# Never needed for extraction. Matched on resource type rather than file
+# extension so webp/avif, query-string and extensionless CDN URLs are caught.
+# Stylesheets are kept: innerText depends on computed styles.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Stealth patches registered once per pooled context; Playwright runs them
+# in every page the context opens
+STEALTH_JS = """
+// Override navigator properties
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+
+// Override chrome property
+window.chrome = {runtime: {}};
+
+// Override permissions
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ?
+    Promise.resolve({state: Notification.permission}) :
+    originalQuery(parameters)
+);
+
+// Hide automation indicators
+delete window.cdc_adoQpoasnfa76pfcZLmcfl_Array;
+delete window.cdc_adoQpoasnfa76pfcZLmcfl_Promise;
+delete window.cdc_adoQpoasnfa76pfcZLmcfl_Symbol;
+"""
+
+# Reads a whole product page in one page.evaluate round-trip instead of a
+# query_selector per field. Takes a spec of {"text": {name: [selectors]},
+# "attrs": {name: [selector, attr]}, "exists": {name: selector}}; text fields
+# take the first selector with non-empty innerText, so fallback selectors are
+# resolved in-page too.
+EXTRACT_FIELDS_JS = """
+(spec) => {
+    const text = (selectors) => {
+        for (const s of selectors) {
+            const value = document.querySelector(s)?.innerText.trim();
+            if (value) return value;
+        }
+        return null;
+    };
+    const fields = {};
+    for (const [name, selectors] of Object.entries(spec.text)) {
+        fields[name] = text(selectors);
+    }
+    for (const [name, [s, attr]] of Object.entries(spec.attrs ?? {})) {
+        fields[name] = document.querySelector(s)?.getAttribute(attr) ?? null;
+    }
+    for (const [name, s] of Object.entries(spec.exists ?? {})) {
+        fields[name] = document.querySelector(s) !== null;
+    }
+    return fields;
+}
+"""
+
+
+def extract_fields_xpath(html: str | bytes, spec: dict) -> dict:
+    """EXTRACT_FIELDS_JS for pages fetched without a browser.
+
+    Same spec shape and results, but with XPath expressions in place of CSS
+    selectors: lxml evaluates XPath natively in C, where a CSS engine over
+    static HTML (BeautifulSoup/soupsieve) is orders of magnitude slower.
+    """
+    tree = lxml.html.fromstring(html)
+
+    def first(path: str):
+        found = tree.xpath(f"({path})[1]")
+        return found[0] if found else None
+
+    fields = {}
+    for name, paths in spec["text"].items():
+        fields[name] = None
+        for path in paths:
+            elem = first(path)
+            value = " ".join(elem.text_content().split()) if elem is not None else None
+            if value:
+                fields[name] = value
+                break
+    for name, (path, attr) in spec.get("attrs", {}).items():
+        elem = first(path)
+        fields[name] = elem.get(attr) if elem is not None else None
+    for name, path in spec.get("exists", {}).items():
+        fields[name] = first(path) is not None
+    return fields
+
+# Every scraper shares one Playwright driver (a node subprocess) per event
+# loop instead of starting its own in __aenter__
+_playwright_start: asyncio.Task | None = None
+
+
+async def get_playwright() -> Playwright:
+    """Shared Playwright driver for the running loop, started on first use."""
+    global _playwright_start
+    loop = asyncio.get_running_loop()
+    if _playwright_start is None or _playwright_start.get_loop() is not loop:
+        _playwright_start = loop.create_task(async_playwright().start())
+    task = _playwright_start
+    try:
+        # Shielded so one cancelled caller can't cancel the shared startup
+        return await asyncio.shield(task)
+    except Exception:
+        if _playwright_start is task and task.done():
+            _playwright_start = None  # let the next caller retry
+        raise
+
+
+async def stop_playwright() -> None:
+    """Stop the shared Playwright driver; call once at application shutdown."""
+    global _playwright_start
+    task, _playwright_start = _playwright_start, None
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        return
+    try:
+        playwright = await task
+    except Exception:
+        return
+    await playwright.stop()
+
+
+@dataclass(slots=True)
 class ScrapedProduct:
     """Data scraped from a product page."""
 
@@ -40,7 +166,7 @@ class ScrapedProduct:
     url: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapedMetrics:
     """Daily metrics scraped from a product page."""
     
@@ -84,35 +210,51 @@ class BaseScraper(ABC):
     # Locales to rotate
     LOCALES = ["en-US", "en-GB", "en-CA", "en-AU"]
 
+    # Browser contexts are reused across scrapes instead of created per page
+    # (settings.scraper_concurrency of them); each is retired after
+    # CONTEXT_MAX_USES pages so fingerprints and cookies still rotate
+    CONTEXT_MAX_USES = 20
+
     def __init__(self):
         self.browser: Browser | None = None
         self.playwright = None
+        self._pool_size = settings.scraper_concurrency
+        self._context_slots = asyncio.Semaphore(self._pool_size)
+        self._idle_contexts: list[BrowserContext] = []
+        self._context_uses: dict[BrowserContext, int] = {}
 
     async def __aenter__(self):
         """Async context manager entry."""
-        self.playwright = await async_playwright().start()
+        self.playwright = await get_playwright()
         
-        # Launch with stealth args
+        # Launch with stealth args. GPU/canvas acceleration is left on:
+        # disabling it forces software raster on composited pages.
         self.browser = await self.playwright.chromium.launch(
             headless=True,
+            chromium_sandbox=False,
             args=[
                 "--disable-blink-features=AutomationControlled",
                 "--disable-dev-shm-usage",
                 "--no-sandbox",
                 "--disable-setuid-sandbox",
-                "--disable-accelerated-2d-canvas",
-                "--disable-gpu",
                 "--window-size=1920,1080",
             ],
         )
+
+        # Warm the context pool so the first scrapes skip context setup
+        self._idle_contexts = list(await asyncio.gather(
+            *(self._new_context() for _ in range(self._pool_size))
+        ))
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        # Closing the browser closes any pooled contexts. The shared driver
+        # stays up for other scrapers until stop_playwright().
+        self._idle_contexts.clear()
+        self._context_uses.clear()
         if self.browser:
             await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
 
     def _get_random_user_agent(self) -> str:
         """Get a random user agent string."""
@@ -127,12 +269,61 @@ class BaseScraper(ABC):
         return random.choice(self.LOCALES)
 
     async def _get_page(self) -> Page:
-        """Create a new page with anti-detection measures."""
+        """Open a page in a pooled context; hand it back with _release_page."""
         if not self.browser:
             raise RuntimeError("Browser not initialized")
-        
+
+        # One slot per open page bounds the pool to _pool_size contexts
+        await self._context_slots.acquire()
+        try:
+            if self._idle_contexts:
+                context = self._idle_contexts.pop()
+            else:
+                context = await self._new_context()
+            return await context.new_page()
+        except Exception:
+            self._context_slots.release()
+            raise
+
+    async def _release_page(self, page: Page) -> None:
+        """Close a page from _get_page and return its context to the pool."""
+        try:
+            context = page.context
+            await page.close()
+            uses = self._context_uses.get(context)
+            if uses is None:
+                # Pool was reset by __aexit__ while the page was open
+                return
+            if uses + 1 >= self.CONTEXT_MAX_USES:
+                del self._context_uses[context]
+                await context.close()
+            else:
+                self._context_uses[context] = uses + 1
+                self._idle_contexts.append(context)
+        finally:
+            self._context_slots.release()
+
+    @staticmethod
+    async def _block_heavy_resources(route: Route, request: Request) -> None:
+        """Abort images, fonts and media by resource type, whatever the URL looks like."""
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @asynccontextmanager
+    async def _page(self) -> AsyncIterator[Page]:
+        """Pooled page for the duration of an `async with` block."""
+        page = await self._get_page()
+        try:
+            yield page
+        finally:
+            await self._release_page(page)
+
+    async def _new_context(self) -> BrowserContext:
+        """Create a browser context with anti-detection measures."""
         # Get proxy if available
-        proxy = proxy_manager.get_proxy()
+        proxy = get_proxy_manager().get_proxy()
         proxy_settings = None
         if proxy:
             proxy_settings = {
@@ -155,37 +346,15 @@ class BaseScraper(ABC):
             color_scheme="light",
             ignore_https_errors=True,  # Fix SSL errors with proxy
         )
+        self._context_uses[context] = 0
         
         # Block unnecessary resources for speed
-        await context.route("**/*.{png,jpg,jpeg,gif,svg,ico,woff,woff2}", lambda route: route.abort())
-        
-        page = await context.new_page()
-
-        # Stealth JavaScript injection
-        await page.add_init_script("""
-            // Override navigator properties
-            Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-            Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-            Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-            
-            // Override chrome property
-            window.chrome = {runtime: {}};
-            
-            // Override permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                Promise.resolve({state: Notification.permission}) :
-                originalQuery(parameters)
-            );
-            
-            // Hide automation indicators
-            delete window.cdc_adoQpoasnfa76pfcZLmcfl_Array;
-            delete window.cdc_adoQpoasnfa76pfcZLmcfl_Promise;
-            delete window.cdc_adoQpoasnfa76pfcZLmcfl_Symbol;
-        """)
-
-        return page
+        await context.route("**/*", self._block_heavy_resources)
+
+        # Stealth JavaScript injection (runs in every page of the context)
+        await context.add_init_script(STEALTH_JS)
+
+        return context
 
     async def _random_delay(self, min_delay: float = None, max_delay: float = None):
         """Add random delay between requests."""
@@ -203,13 +372,13 @@ class BaseScraper(ABC):
 
     async def scrape_with_retry(self, url: str) -> ScrapedProduct | None:
         """Scrape with retry logic and circuit breaker (FREE mode)."""
-        # Check circuit breaker
-        if circuit_breaker.is_open(self.PLATFORM):
+        # Check circuit breaker (may let this call through as the half-open probe)
+        if not await circuit_breaker.allow(self.PLATFORM):
             print(f"Circuit breaker open for {self.PLATFORM}, waiting...")
             return None
         
-        # Rate limiting (slower for free mode)
-        await rate_limiter.acquire()
+        # Rate limiting (slower for free mode), weighted by page cost
+        await rate_limiter.acquire(self.PLATFORM, self._request_cost(url))
         
         # Add human-like delay before scraping
         await asyncio.sleep(random.uniform(2, 5))
@@ -224,10 +393,14 @@ class BaseScraper(ABC):
                     # Null result might mean blocked
                     print(f"Blocked on {url}")
                     circuit_breaker.record_failure(self.PLATFORM)
+                    if circuit_breaker.is_open(self.PLATFORM):
+                        break
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed for {url}: {e}")
                 circuit_breaker.record_failure(self.PLATFORM)
                 
+                if circuit_breaker.is_open(self.PLATFORM):
+                    break
                 if attempt < self.MAX_RETRIES - 1:
                     # Longer exponential backoff for free mode
                     wait_time = (3 ** attempt) + random.uniform(1, 3)
@@ -236,9 +409,60 @@ class BaseScraper(ABC):
         
         return None
 
+    async def scrape_many(
+        self, urls: list[str], concurrency: int | None = None
+    ) -> list[ScrapedProduct | None]:
+        """Scrape URLs concurrently via scrape_with_retry, results in input order.
+
+        At most `concurrency` scrapes (default: the context pool size) are in
+        flight, so page loads overlap while the rate limiter and circuit
+        breaker still gate every request. Failed URLs come back as None.
+        """
+        sem = asyncio.Semaphore(concurrency or self._pool_size)
+        return await asyncio.gather(
+            *(self._bounded_scrape(sem, self.scrape_with_retry, url) for url in urls)
+        )
+
+    async def scrape_products(
+        self, urls: list[str], concurrency: int | None = None
+    ) -> list[ScrapedProduct | None]:
+        """Scrape URLs concurrently via scrape_product, results in input order.
+
+        One attempt per URL with no rate limiting or circuit breaker, for
+        callers doing their own pacing; use scrape_many otherwise. Like
+        scrape_many, `concurrency` defaults to the context pool size.
+        """
+        sem = asyncio.Semaphore(concurrency or self._pool_size)
+        return await asyncio.gather(
+            *(self._bounded_scrape(sem, self.scrape_product, url) for url in urls)
+        )
+
+    @staticmethod
+    async def _bounded_scrape(
+        sem: asyncio.Semaphore,
+        scrape: Callable[[str], Awaitable[ScrapedProduct | None]],
+        url: str,
+    ) -> ScrapedProduct | None:
+        """Run one scrape under sem; exceptions become None so a batch never aborts."""
+        async with sem:
+            try:
+                return await scrape(url)
+            except Exception as e:
+                print(f"Scrape failed for {url}: {e}")
+                return None
+
+    def _request_cost(self, url: str) -> float:
+        """Rate-limit tokens a scrape of this URL consumes; heavier pages cost more."""
+        return 1.0
+
     @abstractmethod
     async def scrape_product(self, url: str) -> ScrapedProduct | None:
-        """Scrape a product page. Must be implemented by subclasses."""
+        """Scrape a product page. Must be implemented by subclasses.
+
+        Called as scrape_product(url) by scrape_with_retry: implementations
+        take a pooled page for this call only (_get_page/_release_page or
+        _page) so no context is held through the retry backoff.
+        """
         pass
 
     @abstractmethod
@@ -1,18 +1,61 @@
 """eBay US product scraper."""
 
+import asyncio
 import re
 import logging
 from dataclasses import dataclass
 from decimal import Decimal
+from urllib.parse import parse_qs, urlsplit
 
-from playwright.async_api import Page
+import httpx
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 
-from .base import BaseScraper, ScrapedProduct, ScrapedMetrics
+from .base import (
+    EXTRACT_FIELDS_JS, BaseScraper, ScrapedProduct, ScrapedMetrics, extract_fields_xpath
+)
+from .proxy_manager import get_proxy_manager
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; these run for every scraped product
+_ITEM_ID_PATTERNS = [
+    re.compile(r"/itm/(\d+)"),            # /itm/123456
+    re.compile(r"/itm/[^/]+/(\d+)"),      # /itm/product-name/123456
+    re.compile(r"item=(\d+)"),            # Query param
+]
+_PRICE_RE = re.compile(r'\$?([\d,]+\.?\d*)')
+_INT_RE = re.compile(r'([\d,]+)')
+_FEEDBACK_RE = re.compile(r'([\d.]+)%')
+
+# Whole path segments / query keys (lowercased) that mark an auction listing
+_AUCTION_PATH_SEGMENTS = {"auction", "bid"}
+_AUCTION_QUERY_KEYS = {"lh_auction", "bid"}
+
+# Reads up to `limit` search result tiles in one page.evaluate round-trip
+_SEARCH_TILES_JS = """
+(limit) => {
+    const text = (tile, s) => tile.querySelector(s)?.innerText.trim() || null;
+    const tiles = [];
+    for (const tile of document.querySelectorAll('li.s-item')) {
+        const href = tile.querySelector('a.s-item__link')?.href;
+        if (!href || !href.includes('/itm/')) continue;
+        tiles.push({
+            href,
+            title: text(tile, '.s-item__title span[role="heading"], .s-item__title'),
+            price: text(tile, '.s-item__price'),
+            image: tile.querySelector('.s-item__image img')?.getAttribute('src') ?? null,
+            condition: text(tile, '.SECONDARY_INFO'),
+            bids: text(tile, '.s-item__bids'),
+            best_offer: (text(tile, '.s-item__purchase-options') ?? '').includes('Best Offer'),
+        });
+        if (tiles.length >= limit) break;
+    }
+    return tiles;
+}
+"""
+
 
-@dataclass
+@dataclass(slots=True)
 class EbayProduct(ScrapedProduct):
     """eBay-specific product data."""
     ebay_id: str | None = None
@@ -43,166 +86,348 @@ class EbayScraper(BaseScraper):
         "Jewelry": "/b/Jewelry-Watches/281",
     }
 
+    TITLE_SELECTOR = 'h1.x-item-title__mainTitle span, #itemTitle'
+
+    # Field specs for EXTRACT_FIELDS_JS; text selectors are tried in order.
+    # The daily metrics pass only needs these few fields...
+    METRICS_SELECTORS = {
+        "text": {
+            "price": ['.x-price-primary span', '#prcIsum'],
+            "sold": ['.x-quantity__availability span'],
+        },
+        "exists": {
+            "out_of_stock": '.d-quantity__availability--out-of-stock',
+        },
+    }
+
+    # ...while first-time discovery reads the whole listing
+    PRODUCT_SELECTORS = {
+        "text": {
+            **METRICS_SELECTORS["text"],
+            "title": ['h1.x-item-title__mainTitle span', '#itemTitle'],
+            "bids": ['.x-bid-count'],
+            "condition": ['.x-item-condition-text span'],
+            "feedback": ['.x-sellercard-atf__data-item span'],
+            "category": ['nav.breadcrumbs li:nth-child(2) a span'],
+        },
+        "attrs": {
+            "image": ['.ux-image-carousel-item img', 'src'],
+        },
+        "exists": {
+            **METRICS_SELECTORS["exists"],
+            "auction": '.x-bid-count',
+            "best_offer": '[data-testid="x-best-offer"]',
+        },
+    }
+
+    # PRODUCT_SELECTORS as XPath, for pages fetched without a browser
+    PRODUCT_XPATHS = {
+        "text": {
+            "price": ['//*[contains(@class, "x-price-primary")]//span', '//*[@id="prcIsum"]'],
+            "sold": ['//*[contains(@class, "x-quantity__availability")]//span'],
+            "title": [
+                '//h1[contains(@class, "x-item-title__mainTitle")]//span',
+                '//*[@id="itemTitle"]',
+            ],
+            "bids": ['//*[contains(@class, "x-bid-count")]'],
+            "condition": ['//*[contains(@class, "x-item-condition-text")]//span'],
+            "feedback": ['//*[contains(@class, "x-sellercard-atf__data-item")]//span'],
+            "category": ['//nav[contains(@class, "breadcrumbs")]//li[2]//a//span'],
+        },
+        "attrs": {
+            "image": ['//*[contains(@class, "ux-image-carousel-item")]//img', 'src'],
+        },
+        "exists": {
+            "out_of_stock": '//*[contains(@class, "d-quantity__availability--out-of-stock")]',
+            "auction": '//*[contains(@class, "x-bid-count")]',
+            "best_offer": '//*[@data-testid="x-best-offer"]',
+        },
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._http: httpx.AsyncClient | None = None
+
+    async def __aenter__(self):
+        """Start the browser pool plus a plain HTTP client for the no-browser path."""
+        await super().__aenter__()
+        proxy = get_proxy_manager().get_proxy()
+        self._http = httpx.AsyncClient(
+            headers={
+                "User-Agent": self._get_random_user_agent(),
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+            proxy=proxy.url if proxy else None,
+            timeout=15.0,
+            follow_redirects=True,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the HTTP client, then the browser."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+
+    def _request_cost(self, url: str) -> float:
+        """Auction pages poll live bid counts, so they count double against the rate limit."""
+        parts = urlsplit(url)
+        segments = {segment.lower() for segment in parts.path.split("/")}
+        params = {key.lower() for key in parse_qs(parts.query)}
+        if segments & _AUCTION_PATH_SEGMENTS or params & _AUCTION_QUERY_KEYS:
+            return 2.0
+        return 1.0
+
     def extract_product_id(self, url: str) -> str | None:
         """Extract eBay item ID from URL."""
-        patterns = [
-            r"/itm/(\d+)",                    # /itm/123456
-            r"/itm/[^/]+/(\d+)",              # /itm/product-name/123456
-            r"item=(\d+)",                     # Query param
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _ITEM_ID_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1)
         return None
 
-    async def scrape_product(self, url: str, page: Page) -> EbayProduct | None:
-        """Scrape eBay product page."""
+    async def scrape_product(self, url: str, page: Page | None = None) -> EbayProduct | None:
+        """Scrape eBay product page.
+
+        Without a page, the server-rendered HTML is tried first and a pooled
+        browser page is only used when that comes back unusable.
+        """
+        if page is None:
+            product = await self.scrape_product_http(url)
+            if product is not None:
+                return product
+            async with self._page() as page:
+                return await self.scrape_product(url, page)
+
         try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_timeout(2000)
-
-            product_id = self.extract_product_id(url)
-
-            # Title
-            title = await self._safe_text(page, 'h1.x-item-title__mainTitle span')
-            if not title:
-                title = await self._safe_text(page, '#itemTitle')
-
-            # Price
-            price_text = await self._safe_text(page, '.x-price-primary span')
-            if not price_text:
-                price_text = await self._safe_text(page, '#prcIsum')
-            price = self._parse_price(price_text)
-
-            # Listing type
-            listing_type = "fixed_price"
-            auction_elem = await page.query_selector('.x-bid-count')
-            if auction_elem:
-                listing_type = "auction"
-                bids_text = await auction_elem.inner_text()
-                bids = self._parse_int(bids_text)
-            else:
-                bids = 0
-
-            best_offer = await page.query_selector('[data-testid="x-best-offer"]')
-            if best_offer:
-                listing_type = "best_offer"
-
-            # Condition
-            condition_text = await self._safe_text(page, '.x-item-condition-text span')
-            condition = condition_text.lower() if condition_text else "used"
-
-            # Seller info
-            seller_name = await self._safe_text(page, '.x-sellercard-atf__info a span')
-            feedback_text = await self._safe_text(page, '.x-sellercard-atf__data-item span')
-            seller_feedback = self._parse_feedback(feedback_text)
-
-            # Reviews/sold count
-            sold_text = await self._safe_text(page, '.x-quantity__availability span')
-            reviews = self._parse_int(sold_text)  # Using sold count as proxy
-
-            # Image
-            image_url = await self._safe_attr(page, '.ux-image-carousel-item img', 'src')
-
-            # Category
-            category = await self._safe_text(page, 'nav.breadcrumbs li:nth-child(2) a span')
-
-            # Stock
-            in_stock = True
-            oos_elem = await page.query_selector('.d-quantity__availability--out-of-stock')
-            if oos_elem:
-                in_stock = False
-
-            return EbayProduct(
-                platform=self.PLATFORM,
-                product_id=product_id or "",
-                url=url,
-                title=title or "Unknown Product",
-                price=price or Decimal("0"),
-                rating=0.0,  # eBay doesn't show product ratings
-                reviews=reviews,
-                brand=None,
-                category=category or "General",
-                image_url=image_url,
-                in_stock=in_stock,
-                seller_count=1,
-                ebay_id=product_id,
-                listing_type=listing_type,
-                bids=bids,
-                condition=condition,
-                seller_feedback=seller_feedback,
-            )
+            if not await self._open_item(url, page):
+                return None
+
+            fields = await page.evaluate(EXTRACT_FIELDS_JS, self.PRODUCT_SELECTORS)
+            return self._product_from_fields(url, fields)
 
         except Exception as e:
             logger.error(f"Error scraping eBay product {url}: {e}")
             return None
 
-    async def scrape_metrics(self, url: str, page: Page) -> ScrapedMetrics | None:
-        """Scrape metrics from eBay product."""
-        product = await self.scrape_product(url, page)
-        if not product:
+    async def scrape_product_http(self, url: str) -> EbayProduct | None:
+        """Scrape an eBay listing from its HTML without rendering it.
+
+        Returns None when there's no HTTP client (outside `async with`), the
+        fetch fails, or the page has no item title (e.g. eBay's bot check),
+        so callers can fall back to the browser.
+        """
+        if self._http is None:
             return None
+        try:
+            response = await self._http.get(url)
+            if response.status_code != 200:
+                return None
+            # Parsing a full listing takes tens of ms; keep it off the event loop
+            fields = await asyncio.to_thread(
+                extract_fields_xpath, response.content, self.PRODUCT_XPATHS
+            )
+            if not fields["title"]:
+                return None
+            return self._product_from_fields(url, fields)
+
+        except Exception as e:
+            logger.warning(f"eBay HTTP scrape failed for {url}: {e}")
+            return None
+
+    def _product_from_fields(self, url: str, fields: dict) -> EbayProduct:
+        """Build an EbayProduct from PRODUCT_SELECTORS fields."""
+        product_id = self.extract_product_id(url)
+
+        # Title
+        title = fields["title"]
+
+        # Price
+        price = self._parse_price(fields["price"])
+
+        # Listing type
+        listing_type = "fixed_price"
+        if fields["auction"]:
+            listing_type = "auction"
+            bids = self._parse_int(fields["bids"])
+        else:
+            bids = 0
 
-        return ScrapedMetrics(
-            price=product.price,
+        if fields["best_offer"]:
+            listing_type = "best_offer"
+
+        # Condition
+        condition_text = fields["condition"]
+        condition = condition_text.lower() if condition_text else "used"
+
+        # Seller info
+        seller_feedback = self._parse_feedback(fields["feedback"])
+
+        # Reviews/sold count
+        reviews = self._parse_int(fields["sold"])  # Using sold count as proxy
+
+        # Image
+        image_url = fields["image"]
+
+        # Category
+        category = fields["category"]
+
+        # Stock
+        in_stock = not fields["out_of_stock"]
+
+        return EbayProduct(
+            platform=self.PLATFORM,
+            asin=product_id or "",
+            product_id=product_id or "",
+            url=url,
+            title=title or "Unknown Product",
+            price=price or Decimal("0"),
             original_price=None,
             discount_percent=None,
             rank=None,
-            reviews=product.reviews,
-            rating=product.rating,
+            rating=0.0,  # eBay doesn't show product ratings
+            reviews=reviews,
+            brand=None,
+            category=category or "General",
+            image_url=image_url,
+            in_stock=in_stock,
             seller_count=1,
-            in_stock=product.in_stock,
-            delivery_days=5,  # Typical eBay shipping
+            delivery_days=None,
             buybox_owner=None,
+            ebay_id=product_id,
+            listing_type=listing_type,
+            bids=bids,
+            condition=condition,
+            seller_feedback=seller_feedback,
         )
 
+    async def scrape_metrics(self, url: str, page: Page) -> ScrapedMetrics | None:
+        """Scrape metrics from eBay product, reading only the metric fields."""
+        try:
+            if not await self._open_item(url, page):
+                return None
+
+            fields = await page.evaluate(EXTRACT_FIELDS_JS, self.METRICS_SELECTORS)
+
+            return ScrapedMetrics(
+                price=self._parse_price(fields["price"]) or Decimal("0"),
+                original_price=None,
+                discount_percent=None,
+                rank=None,
+                reviews=self._parse_int(fields["sold"]),  # Using sold count as proxy
+                rating=0.0,  # eBay doesn't show product ratings
+                seller_count=1,
+                in_stock=not fields["out_of_stock"],
+                delivery_days=5,  # Typical eBay shipping
+                buybox_owner=None,
+            )
+
+        except Exception as e:
+            logger.error(f"Error scraping eBay metrics {url}: {e}")
+            return None
+
+    async def _open_item(self, url: str, page: Page) -> bool:
+        """Navigate to an item page; False if the listing never renders."""
+        # Return on first response bytes and wait only for the title node,
+        # not for eBay's tracker scripts to finish parsing
+        await page.goto(url, wait_until="commit", timeout=15000)
+        try:
+            await page.locator(self.TITLE_SELECTOR).first.wait_for(state="attached", timeout=8000)
+        except PlaywrightTimeout:
+            logger.warning(f"No eBay item title on {url}")
+            return False
+        return True
+
     async def search_products(self, query: str, page: Page, limit: int = 50) -> list[EbayProduct]:
-        """Search for products on eBay."""
+        """Search for products on eBay, reading listings from the result tiles.
+
+        Seller feedback, category and stock aren't on the tiles; use
+        search_products_detailed when those are needed.
+        """
         products = []
         try:
-            search_url = f"{self.BASE_URL}/sch/i.html?_nkw={query.replace(' ', '+')}&_sop=12"
-            await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_timeout(2000)
-
-            items = await page.query_selector_all('.s-item__link')
-            for item in items[:limit]:
-                href = await item.get_attribute('href')
-                if href and '/itm/' in href:
-                    product = await self.scrape_product(href, page)
-                    if product:
-                        products.append(product)
+            if not await self._open_search(query, page):
+                return products
+
+            for tile in await page.evaluate(_SEARCH_TILES_JS, limit):
+                product_id = self.extract_product_id(tile["href"])
+                if tile["bids"]:
+                    listing_type = "auction"
+                elif tile["best_offer"]:
+                    listing_type = "best_offer"
+                else:
+                    listing_type = "fixed_price"
+                condition_text = tile["condition"]
+
+                products.append(EbayProduct(
+                    platform=self.PLATFORM,
+                    asin=product_id or "",
+                    product_id=product_id or "",
+                    url=tile["href"],
+                    title=tile["title"] or "Unknown Product",
+                    price=self._parse_price(tile["price"]) or Decimal("0"),
+                    original_price=None,
+                    discount_percent=None,
+                    rank=None,
+                    rating=0.0,  # eBay doesn't show product ratings
+                    reviews=0,
+                    brand=None,
+                    category="General",
+                    image_url=tile["image"],
+                    in_stock=True,  # Sold-out listings drop out of search
+                    seller_count=1,
+                    delivery_days=None,
+                    buybox_owner=None,
+                    ebay_id=product_id,
+                    listing_type=listing_type,
+                    bids=self._parse_int(tile["bids"]),
+                    condition=condition_text.lower() if condition_text else "used",
+                ))
 
         except Exception as e:
             logger.error(f"Error searching eBay: {e}")
 
         return products
 
-    async def _safe_text(self, page: Page, selector: str) -> str | None:
-        """Safely get text from selector."""
+    async def search_products_detailed(self, query: str, limit: int = 50) -> list[EbayProduct]:
+        """Search for products on eBay, scraping each listing's own page.
+
+        The search page goes back to the pool before the listings are
+        scraped, so browser fallbacks can use every pooled context.
+        """
         try:
-            elem = await page.query_selector(selector)
-            if elem:
-                return (await elem.inner_text()).strip()
-        except Exception:
-            pass
-        return None
+            async with self._page() as page:
+                if not await self._open_search(query, page):
+                    return []
+                hrefs = await page.eval_on_selector_all(
+                    '.s-item__link',
+                    '(links, limit) => links.slice(0, limit).map((a) => a.href)',
+                    limit,
+                )
+        except Exception as e:
+            logger.error(f"Error searching eBay: {e}")
+            return []
+
+        results = await self.scrape_many([href for href in hrefs if href and '/itm/' in href])
+        return [product for product in results if product is not None]
 
-    async def _safe_attr(self, page: Page, selector: str, attr: str) -> str | None:
-        """Safely get attribute from selector."""
+    async def _open_search(self, query: str, page: Page) -> bool:
+        """Navigate to the search results; False if no listings render."""
+        search_url = f"{self.BASE_URL}/sch/i.html?_nkw={query.replace(' ', '+')}&_sop=12"
+        await page.goto(search_url, wait_until="commit", timeout=15000)
         try:
-            elem = await page.query_selector(selector)
-            if elem:
-                return await elem.get_attribute(attr)
-        except Exception:
-            pass
-        return None
+            await page.locator('.s-item__link').first.wait_for(state="attached", timeout=8000)
+        except PlaywrightTimeout:
+            logger.warning(f"No eBay search results for {query!r}")
+            return False
+        return True
 
     def _parse_price(self, text: str | None) -> Decimal | None:
         """Parse price from text."""
         if not text:
             return None
-        match = re.search(r'\$?([\d,]+\.?\d*)', text.replace(',', ''))
+        match = _PRICE_RE.search(text.replace(',', ''))
         if match:
             return Decimal(match.group(1))
         return None
@@ -211,7 +436,7 @@ class EbayScraper(BaseScraper):
         """Parse integer from text."""
         if not text:
             return 0
-        match = re.search(r'([\d,]+)', text.replace(',', ''))
+        match = _INT_RE.search(text.replace(',', ''))
         if match:
             return int(match.group(1))
         return 0
@@ -220,7 +445,7 @@ class EbayScraper(BaseScraper):
         """Parse feedback percentage."""
         if not text:
             return 0.0
-        match = re.search(r'([\d.]+)%', text)
+        match = _FEEDBACK_RE.search(text)
         if match:
             return float(match.group(1))
         return 0.0
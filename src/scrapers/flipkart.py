@@ -1,35 +1,106 @@
 """Flipkart India product scraper."""
 
 import re
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
 
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+from playwright.async_api import Page, Response, TimeoutError as PlaywrightTimeout
 
 from .base import BaseScraper, ScrapedProduct
 
+# Compiled once; these run for every scraped product
+_FSN_PATTERNS = [
+    re.compile(r"pid=([A-Z0-9]+)", re.IGNORECASE),
+    re.compile(r"/p/([a-z]+)\?", re.IGNORECASE),
+    re.compile(r"itm([A-Za-z0-9]+)", re.IGNORECASE),
+]
+# Matches the number with its thousands separators, so only the match
+# needs the commas stripped (the ₹ sign is simply skipped)
+_PRICE_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_RATING_RE = re.compile(r"(\d+\.?\d*)")
+_REVIEWS_LABELED_RE = re.compile(r"([\d,]+)\s*(?:Reviews|Ratings)", re.IGNORECASE)
+_REVIEWS_NUM_RE = re.compile(r"([\d,]+)")
+_DAYS_RE = re.compile(r"(\d+)\s*days?", re.IGNORECASE)
+_BLOCKED_RE = re.compile(
+    r"access denied|please verify you are a human|captcha|are you a robot|not a robot",
+    re.IGNORECASE,
+)
+# Statuses Flipkart's bot protection answers with; no page text needed
+_BLOCKED_STATUSES = frozenset({403, 429, 503})
+
+# Block pages state it near the top, so only the start of the visible text
+# crosses CDP rather than the full page HTML
+_BODY_TEXT_PREFIX_JS = "() => document.body?.innerText.slice(0, 4096) ?? ''"
+
+# Reads every product-page field in one page.evaluate round-trip instead of a
+# query_selector/text_content pair per selector. Each SELECTORS value lists
+# selectors in priority order; the first one that matches wins, as in
+# EXTRACT_FIELDS_JS.
+_EXTRACT_PRODUCT_JS = """
+(sel) => {
+    const text = (selectors) => {
+        for (const s of selectors) {
+            const value = document.querySelector(s)?.textContent.trim();
+            if (value) return value;
+        }
+        return null;
+    };
+    const fields = {};
+    for (const [name, selectors] of Object.entries(sel)) {
+        if (name !== "category" && name !== "image") fields[name] = text(selectors);
+    }
+    // Second-to-last breadcrumb is the most specific category
+    fields.category = null;
+    for (const s of sel.category) {
+        const crumbs = document.querySelectorAll(s);
+        if (crumbs.length === 0) continue;
+        if (crumbs.length > 1) {
+            fields.category = crumbs[crumbs.length - 2].textContent.trim() || null;
+        }
+        break;
+    }
+    fields.image = null;
+    for (const s of sel.image) {
+        const img = document.querySelector(s);
+        if (img) {
+            fields.image = img.getAttribute("src") || null;
+            break;
+        }
+    }
+    return fields;
+}
+"""
+
+# Absolute hrefs of the first `limit` matched links, in one round-trip instead
+# of a get_attribute call per link
+_LINK_HREFS_JS = "(links, limit) => links.slice(0, limit).map((a) => a.href)"
+
 
 class FlipkartScraper(BaseScraper):
     """Scraper for Flipkart India product pages."""
 
     BASE_URL = "https://www.flipkart.com"
 
-    # Selectors for Flipkart product page
+    # Selectors for Flipkart product page (plain CSS, evaluated in-page by _EXTRACT_PRODUCT_JS)
     SELECTORS = {
-        "title": "span.VU-ZEz, h1._6EBuvT, span.B_NuCI",
-        "price": "div.Nx9bqj.CxhGGd, div._30jeq3._16Jk6d",
-        "original_price": "div.yRaY8j.A6+E6v, div._3I9_wc._2p6lqe",
-        "rating": "div.XQDdHH, div._3LWZlK",
-        "reviews": "span.Wphh3N span:last-child, span._2_R_DZ span",
-        "category": "div._1MR4o5 a, div._3GIHBu a",
-        "brand": "span.mEh187, div._2WkVRV",
-        "image": "img._396cs4._2amPTt._3qGmMb, img._2r_T1I",
-        "availability": "div._16FRp0, div.Z8JjpR",
-        "seller": "div._1RLviB span, #sellerName span",
-        "delivery": "div._3XINqE, span.U-rGRe",
-        "highlights": "div._2418kt li, div.xFVion li",
-        "specifications": "div._3k-BhJ",
+        "title": ["span.VU-ZEz", "h1._6EBuvT", "span.B_NuCI"],
+        "price": ["div.Nx9bqj.CxhGGd", "div._30jeq3._16Jk6d"],
+        "original_price": ["div.yRaY8j.A6+E6v", "div._3I9_wc._2p6lqe"],
+        "rating": ["div.XQDdHH", "div._3LWZlK"],
+        "reviews": ["span.Wphh3N span:last-child", "span._2_R_DZ span"],
+        "category": ["div._1MR4o5 a", "div._3GIHBu a"],
+        "brand": ["span.mEh187", "div._2WkVRV"],
+        "image": ["img._396cs4._2amPTt._3qGmMb", "img._2r_T1I"],
+        "availability": ["div._16FRp0", "div.Z8JjpR"],
+        "seller": ["div._1RLviB span", "#sellerName span"],
+        "delivery": ["div._3XINqE", "span.U-rGRe"],
     }
 
+    # Product tile links on listing pages
+    PRODUCT_LINK_SELECTOR = "a._1fQZEK, a.CGtC98, a.IRpwTa, a._2UzuFa"
+
+    # Close (X) button of the login modal shown on first visit
+    LOGIN_POPUP_CLOSE_SELECTOR = "button._2KpZ6l._2doB4z"
+
     # Category mapping for Flipkart
     CATEGORY_PATHS = {
         "Electronics": "/electronics/pr",
@@ -50,12 +121,12 @@ class FlipkartScraper(BaseScraper):
 
         try:
             # Handle Flipkart login popup
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
             await self._close_login_popup(page)
             await self._random_delay()
 
             # Check for blocking
-            if await self._is_blocked(page):
+            if await self._is_blocked(page, response):
                 print(f"Blocked on {url}")
                 return None
 
@@ -65,31 +136,33 @@ class FlipkartScraper(BaseScraper):
                 print(f"Could not extract FSN from {url}")
                 return None
 
-            title = await self._get_text(page, self.SELECTORS["title"])
+            fields = await page.evaluate(_EXTRACT_PRODUCT_JS, self.SELECTORS)
+
+            title = fields["title"]
             if not title:
                 print(f"Could not find title for {url}")
                 return None
 
-            price = await self._get_price(page, self.SELECTORS["price"])
-            original_price = await self._get_price(page, self.SELECTORS["original_price"])
+            price = self._parse_price(fields["price"])
+            original_price = self._parse_price(fields["original_price"])
 
             # Calculate discount
             discount_percent = None
             if original_price and price and original_price > price:
                 discount_percent = float((original_price - price) / original_price * 100)
 
-            rating = await self._get_rating(page)
-            reviews = await self._get_reviews(page)
-            category = await self._get_category(page)
-            brand = await self._get_text(page, self.SELECTORS["brand"])
-            image_url = await self._get_attribute(page, self.SELECTORS["image"], "src")
-            in_stock = await self._check_availability(page)
-            seller = await self._get_text(page, self.SELECTORS["seller"])
-            delivery_days = await self._get_delivery_days(page)
+            rating = self._parse_rating(fields["rating"])
+            reviews = self._parse_reviews(fields["reviews"])
+            category = fields["category"]
+            brand = fields["brand"]
+            image_url = fields["image"]
+            in_stock = self._parse_availability(fields["availability"])
+            seller = fields["seller"]
+            delivery_days = self._parse_delivery_days(fields["delivery"])
 
             return ScrapedProduct(
                 asin=fsn,  # Using FSN as the product ID
-                title=title.strip(),
+                title=title,
                 price=price or Decimal("0"),
                 original_price=original_price,
                 discount_percent=discount_percent,
@@ -100,9 +173,9 @@ class FlipkartScraper(BaseScraper):
                 seller_count=1,  # Would need separate call to get all sellers
                 in_stock=in_stock,
                 image_url=image_url,
-                brand=brand.strip() if brand else None,
+                brand=brand,
                 delivery_days=delivery_days,
-                buybox_owner=seller.strip() if seller else None,
+                buybox_owner=seller,
             )
 
         except PlaywrightTimeout:
@@ -112,7 +185,7 @@ class FlipkartScraper(BaseScraper):
             print(f"Error scraping {url}: {e}")
             return None
         finally:
-            await page.context.close()
+            await self._release_page(page)
 
     async def scrape_category_page(self, category: str, page_num: int = 1) -> list[str]:
         """Scrape product URLs from a Flipkart category page."""
@@ -123,30 +196,23 @@ class FlipkartScraper(BaseScraper):
             category_path = self.CATEGORY_PATHS.get(category, f"/search?q={category}")
             search_url = f"{self.BASE_URL}{category_path}?page={page_num}"
 
-            await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
+            response = await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
             await self._close_login_popup(page)
             await self._random_delay()
 
-            if await self._is_blocked(page):
+            if await self._is_blocked(page, response):
                 return urls
 
             # Find product links
-            links = await page.query_selector_all("a._1fQZEK, a.CGtC98, a.IRpwTa, a._2UzuFa")
+            hrefs = await page.eval_on_selector_all(self.PRODUCT_LINK_SELECTOR, _LINK_HREFS_JS, 50)
 
-            for link in links[:50]:
-                href = await link.get_attribute("href")
-                if href:
-                    full_url = href if href.startswith("http") else f"{self.BASE_URL}{href}"
-                    if "/p/" in full_url or "pid=" in full_url:
-                        urls.append(full_url)
-
-            # Deduplicate
-            urls = list(set(urls))
+            # Deduplicate, keeping page order
+            urls = list(dict.fromkeys(href for href in hrefs if "/p/" in href or "pid=" in href))
 
         except Exception as e:
             print(f"Error scraping category {category}: {e}")
         finally:
-            await page.context.close()
+            await self._release_page(page)
 
         return urls
 
@@ -160,29 +226,23 @@ class FlipkartScraper(BaseScraper):
             category_path = self.CATEGORY_PATHS.get(category, f"/search?q={category}")
             bestseller_url = f"{self.BASE_URL}{category_path}?sort=popularity"
 
-            await page.goto(bestseller_url, wait_until="domcontentloaded", timeout=30000)
+            response = await page.goto(bestseller_url, wait_until="domcontentloaded", timeout=30000)
             await self._close_login_popup(page)
             await self._random_delay()
 
-            if await self._is_blocked(page):
+            if await self._is_blocked(page, response):
                 return urls
 
             # Find product links
-            links = await page.query_selector_all("a._1fQZEK, a.CGtC98, a.IRpwTa, a._2UzuFa")
-
-            for link in links[:100]:
-                href = await link.get_attribute("href")
-                if href:
-                    full_url = href if href.startswith("http") else f"{self.BASE_URL}{href}"
-                    if "/p/" in full_url or "pid=" in full_url:
-                        urls.append(full_url)
+            hrefs = await page.eval_on_selector_all(self.PRODUCT_LINK_SELECTOR, _LINK_HREFS_JS, 100)
 
-            urls = list(set(urls))
+            # Deduplicate, keeping the popularity order
+            urls = list(dict.fromkeys(href for href in hrefs if "/p/" in href or "pid=" in href))
 
         except Exception as e:
             print(f"Error scraping bestsellers {category}: {e}")
         finally:
-            await page.context.close()
+            await self._release_page(page)
 
         return urls
 
@@ -190,13 +250,8 @@ class FlipkartScraper(BaseScraper):
 
     def _extract_fsn(self, url: str) -> str | None:
         """Extract FSN (product ID) from Flipkart URL."""
-        patterns = [
-            r"pid=([A-Z0-9]+)",
-            r"/p/([a-z]+)\?",
-            r"itm([A-Za-z0-9]+)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url, re.IGNORECASE)
+        for pattern in _FSN_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1).upper()
 
@@ -211,119 +266,75 @@ class FlipkartScraper(BaseScraper):
         return None
 
     async def _close_login_popup(self, page: Page):
-        """Close the Flipkart login popup if it appears."""
+        """Close the Flipkart login popup if it appears.
+
+        is_visible() doesn't wait, so pages without the popup cost one
+        round-trip; no settle sleep after the click since callers follow
+        with _random_delay().
+        """
+        close_button = page.locator(self.LOGIN_POPUP_CLOSE_SELECTOR).first
         try:
-            close_button = await page.query_selector("button._2KpZ6l._2doB4z")
-            if close_button:
-                await close_button.click()
-                await page.wait_for_timeout(500)
+            if await close_button.is_visible():
+                await close_button.click(timeout=1000)
         except Exception:
             pass
 
-    async def _is_blocked(self, page: Page) -> bool:
-        """Check if we hit a CAPTCHA or block page."""
-        content = await page.content()
-        blocked_indicators = [
-            "Access Denied",
-            "Please verify you are a human",
-            "captcha",
-            "robot",
-        ]
-        return any(indicator.lower() in content.lower() for indicator in blocked_indicators)
-
-    async def _get_text(self, page: Page, selector: str) -> str | None:
-        """Get text content of an element, trying multiple selectors."""
-        selectors = selector.split(", ")
-        for sel in selectors:
-            try:
-                element = await page.query_selector(sel.strip())
-                if element:
-                    text = await element.text_content()
-                    if text and text.strip():
-                        return text.strip()
-            except Exception:
-                continue
-        return None
-
-    async def _get_attribute(self, page: Page, selector: str, attr: str) -> str | None:
-        """Get attribute value of an element."""
-        selectors = selector.split(", ")
-        for sel in selectors:
-            try:
-                element = await page.query_selector(sel.strip())
-                if element:
-                    value = await element.get_attribute(attr)
-                    if value:
-                        return value
-            except Exception:
-                continue
-        return None
-
-    async def _get_price(self, page: Page, selector: str) -> Decimal | None:
-        """Extract price from element (handles ₹ symbol)."""
-        text = await self._get_text(page, selector)
+    async def _is_blocked(self, page: Page, response: Response | None = None) -> bool:
+        """Check if we hit a CAPTCHA or block page.
+
+        The goto() response status and the final URL are checked first; the
+        visible text is only read when both look normal.
+        """
+        if response is not None and response.status in _BLOCKED_STATUSES:
+            return True
+        if "captcha" in page.url.lower():
+            return True
+        text = await page.evaluate(_BODY_TEXT_PREFIX_JS)
+        return _BLOCKED_RE.search(text) is not None
+
+    def _parse_price(self, text: str | None) -> Decimal | None:
+        """Extract price from element text (handles ₹ symbol)."""
         if text:
-            # Remove ₹ symbol and commas
-            cleaned = text.replace("₹", "").replace(",", "").strip()
-            match = re.search(r"[\d]+\.?\d*", cleaned)
+            match = _PRICE_RE.search(text)
             if match:
-                try:
-                    return Decimal(match.group())
-                except InvalidOperation:
-                    pass
+                return Decimal(match.group().replace(",", ""))
         return None
 
-    async def _get_rating(self, page: Page) -> float:
+    def _parse_rating(self, text: str | None) -> float:
         """Extract product rating."""
-        text = await self._get_text(page, self.SELECTORS["rating"])
         if text:
-            match = re.search(r"(\d+\.?\d*)", text)
+            match = _RATING_RE.search(text)
             if match:
                 return float(match.group(1))
         return 0.0
 
-    async def _get_reviews(self, page: Page) -> int:
+    def _parse_reviews(self, text: str | None) -> int:
         """Extract review count."""
-        text = await self._get_text(page, self.SELECTORS["reviews"])
         if text:
             # Handle formats like "45,234 Reviews" or "1,234 Ratings & 567 Reviews"
-            match = re.search(r"([\d,]+)\s*(?:Reviews|Ratings)", text, re.IGNORECASE)
+            match = _REVIEWS_LABELED_RE.search(text)
             if match:
                 return int(match.group(1).replace(",", ""))
             # Try just extracting first number
-            match = re.search(r"([\d,]+)", text)
+            match = _REVIEWS_NUM_RE.search(text)
             if match:
                 return int(match.group(1).replace(",", ""))
         return 0
 
-    async def _get_category(self, page: Page) -> str | None:
-        """Extract category from breadcrumbs."""
-        try:
-            breadcrumbs = await page.query_selector_all(self.SELECTORS["category"].split(", ")[0])
-            if breadcrumbs and len(breadcrumbs) > 1:
-                # Get second-to-last breadcrumb (more specific category)
-                category = await breadcrumbs[-2].text_content()
-                return category.strip() if category else None
-        except Exception:
-            pass
-        return None
-
-    async def _check_availability(self, page: Page) -> bool:
+    def _parse_availability(self, text: str | None) -> bool:
         """Check if product is in stock."""
-        text = await self._get_text(page, self.SELECTORS["availability"])
         if text:
             out_of_stock_phrases = ["out of stock", "currently unavailable", "sold out"]
             return not any(phrase in text.lower() for phrase in out_of_stock_phrases)
         return True
 
-    async def _get_delivery_days(self, page: Page) -> int | None:
+    def _parse_delivery_days(self, text: str | None) -> int | None:
         """Extract estimated delivery days."""
-        text = await self._get_text(page, self.SELECTORS["delivery"])
         if text:
             # Look for patterns like "Delivery by Mon, Feb 10" or "2 days"
             if "tomorrow" in text.lower():
                 return 1
-            match = re.search(r"(\d+)\s*days?", text, re.IGNORECASE)
+            match = _DAYS_RE.search(text)
             if match:
                 return int(match.group(1))
         return None
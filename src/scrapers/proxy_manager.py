@@ -2,12 +2,17 @@
 
 import random
 import asyncio
+import time
+from functools import lru_cache
 from dataclasses import dataclass
+from enum import Enum
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 
+from src.config import settings
 
-@dataclass
+
+@dataclass(slots=True)
 class ProxyConfig:
     """Proxy configuration."""
     host: str
@@ -52,65 +57,154 @@ class ProxyManager:
         pass
 
 
+class TokenBucket:
+    """Allows bursts of up to `capacity` requests at a sustained `rate` per second."""
+
+    __slots__ = ("capacity", "rate", "tokens", "last_refill", "lock")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, cost: float = 1.0):
+        """Take `cost` tokens, waiting for the refill if the bucket is short.
+
+        Tokens are reserved before sleeping (the balance may go negative), so
+        concurrent callers queue up in order without re-checking in a loop.
+        """
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= cost
+            wait_time = -self.tokens / self.rate
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+
 class RateLimiter:
-    """Rate limiter for scrapers - slower for free mode to avoid blocks."""
+    """Per-platform rate limiter for scrapers - slower for free mode to avoid blocks."""
     
-    def __init__(self, requests_per_minute: int = 5):  # Slower for free mode
+    def __init__(self, requests_per_minute: int = 5, burst: int = 5):  # Slower for free mode
         self.requests_per_minute = requests_per_minute
-        self.request_times: list[datetime] = []
-    
-    async def acquire(self):
-        """Wait if rate limit exceeded."""
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        
-        # Clean old entries
-        self.request_times = [t for t in self.request_times if t > minute_ago]
-        
-        if len(self.request_times) >= self.requests_per_minute:
-            # Wait until oldest request expires
-            wait_time = (self.request_times[0] - minute_ago).total_seconds()
-            if wait_time > 0:
-                await asyncio.sleep(wait_time + 0.5)
-        
-        self.request_times.append(now)
+        self.burst = burst
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def bucket_for(self, platform: str) -> TokenBucket:
+        """Get the token bucket for a platform, creating it on first use."""
+        bucket = self.buckets.get(platform)
+        if bucket is None:
+            bucket = TokenBucket(self.burst, self.requests_per_minute / 60)
+            self.buckets[platform] = bucket
+        return bucket
+
+    async def acquire(self, platform: str = "default", cost: float = 1.0):
+        """Wait until the platform's rate limit allows a request of this cost."""
+        await self.bucket_for(platform).acquire(cost)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"  # one probe request in flight
+
+
+class _Circuit:
+    """Breaker state for a single platform."""
+
+    __slots__ = ("state", "failures", "open_until", "reset_timeout")
+
+    def __init__(self, reset_timeout: float):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self.reset_timeout = reset_timeout
 
 
 class CircuitBreaker:
-    """Circuit breaker for failing scrapers."""
+    """Circuit breaker for failing scrapers.
+
+    After reset_timeout an open circuit lets exactly one probe through
+    (half-open); the probe's outcome closes the circuit or reopens it with
+    the timeout doubled, up to max_reset_timeout.
+    """
     
-    def __init__(self, failure_threshold: int = 3, reset_timeout: int = 300):
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: int = 300,  # 5 minutes for free mode
+        max_reset_timeout: int = 3600,
+    ):
         self.failure_threshold = failure_threshold
-        self.reset_timeout = reset_timeout  # 5 minutes for free mode
-        self.failures: dict[str, int] = {}
-        self.open_circuits: dict[str, datetime] = {}
-    
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.circuits: dict[str, _Circuit] = {}
+
+    def _circuit(self, platform: str) -> _Circuit:
+        circuit = self.circuits.get(platform)
+        if circuit is None:
+            circuit = _Circuit(self.reset_timeout)
+            self.circuits[platform] = circuit
+        return circuit
+
     def is_open(self, platform: str) -> bool:
-        """Check if circuit is open (blocking requests)."""
-        if platform in self.open_circuits:
-            if datetime.now() - self.open_circuits[platform] > timedelta(seconds=self.reset_timeout):
-                # Reset circuit
-                del self.open_circuits[platform]
-                self.failures[platform] = 0
-                return False
+        """Check if requests to the platform are currently being rejected."""
+        circuit = self.circuits.get(platform)
+        if circuit is None or circuit.state is CircuitState.CLOSED:
+            return False
+        return time.monotonic() < circuit.open_until
+
+    async def allow(self, platform: str) -> bool:
+        """Decide whether a request to the platform may go ahead.
+
+        The check and state change run without an await in between, so they
+        are atomic on the event loop and only one caller can take the probe.
+        A probe that never reports back expires after reset_timeout.
+        """
+        circuit = self.circuits.get(platform)
+        if circuit is None or circuit.state is CircuitState.CLOSED:
             return True
-        return False
+        now = time.monotonic()
+        if now < circuit.open_until:
+            return False
+        circuit.state = CircuitState.HALF_OPEN
+        circuit.open_until = now + circuit.reset_timeout
+        return True
     
     def record_failure(self, platform: str):
         """Record a failure for a platform."""
-        self.failures[platform] = self.failures.get(platform, 0) + 1
-        if self.failures[platform] >= self.failure_threshold:
-            self.open_circuits[platform] = datetime.now()
-            print(f"Circuit breaker OPEN for {platform} - waiting {self.reset_timeout}s")
+        circuit = self._circuit(platform)
+        circuit.failures += 1
+        if circuit.state is CircuitState.HALF_OPEN or circuit.failures >= self.failure_threshold:
+            if circuit.state is CircuitState.OPEN:
+                return  # already open, keep the current deadline
+            circuit.state = CircuitState.OPEN
+            circuit.open_until = time.monotonic() + circuit.reset_timeout
+            print(f"Circuit breaker OPEN for {platform} - waiting {circuit.reset_timeout}s")
+            circuit.reset_timeout = min(self.max_reset_timeout, circuit.reset_timeout * 2)
     
     def record_success(self, platform: str):
         """Record a success for a platform."""
-        self.failures[platform] = 0
-        if platform in self.open_circuits:
-            del self.open_circuits[platform]
+        circuit = self.circuits.get(platform)
+        if circuit is not None:
+            circuit.state = CircuitState.CLOSED
+            circuit.failures = 0
+            circuit.reset_timeout = self.reset_timeout
+
+
+@lru_cache(maxsize=1)
+def get_proxy_manager() -> ProxyManager:
+    """Shared ProxyManager, built on first use rather than at import."""
+    return ProxyManager()
 
 
 # Global instances - configured for free mode
-proxy_manager = ProxyManager()
-rate_limiter = RateLimiter(requests_per_minute=5)  # Slower for free
+rate_limiter = RateLimiter(
+    requests_per_minute=settings.scrape_requests_per_minute,
+    burst=settings.scrape_burst,
+)
 circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=300)
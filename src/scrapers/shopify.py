@@ -8,12 +8,12 @@ from urllib.parse import urlparse
 
 from playwright.async_api import Page
 
-from .base import BaseScraper, ScrapedProduct, ScrapedMetrics
+from .base import EXTRACT_FIELDS_JS, BaseScraper, ScrapedProduct, ScrapedMetrics
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShopifyProduct(ScrapedProduct):
     """Shopify-specific product data."""
     shopify_id: str | None = None
@@ -35,6 +35,25 @@ class ShopifyScraper(BaseScraper):
 
     PLATFORM = "shopify"
 
+    # Field spec for EXTRACT_FIELDS_JS over common Shopify theme markup;
+    # text selectors are tried in order
+    HTML_SELECTORS = {
+        "text": {
+            "title": ['.product-title', 'h1.product__title', '[data-product-title]', 'h1'],
+            "price": ['.product-price', '.price__regular .price-item', '[data-product-price]'],
+            "compare_price": ['.price__compare .price-item'],
+            "vendor": ['.product-vendor', '[data-vendor]'],
+        },
+        "attrs": {
+            "image": ['.product-featured-image img, .product__media img', 'src'],
+        },
+        "exists": {
+            "sold_out": '[data-soldout]',
+            "add_enabled": '[data-add-to-cart]:not([disabled])',
+            "add_disabled": '[data-add-to-cart][disabled]',
+        },
+    }
+
     def extract_product_id(self, url: str) -> str | None:
         """Extract Shopify product handle from URL."""
         patterns = [
@@ -52,8 +71,12 @@ class ShopifyScraper(BaseScraper):
         parsed = urlparse(url)
         return parsed.netloc
 
-    async def scrape_product(self, url: str, page: Page) -> ShopifyProduct | None:
-        """Scrape Shopify product page."""
+    async def scrape_product(self, url: str, page: Page | None = None) -> ShopifyProduct | None:
+        """Scrape Shopify product page, on a pooled page unless one is given."""
+        if page is None:
+            async with self._page() as page:
+                return await self.scrape_product(url, page)
+
         try:
             # Try JSON API first (faster and more reliable)
             json_product = await self._fetch_product_json(url, page)
@@ -102,10 +125,14 @@ class ShopifyScraper(BaseScraper):
                     
                     return ShopifyProduct(
                         platform=self.PLATFORM,
+                        asin=str(product_data.get('id', handle)),
                         product_id=str(product_data.get('id', handle)),
                         url=url,
                         title=product_data.get('title', 'Unknown'),
                         price=price,
+                        original_price=compare_price or None,
+                        discount_percent=None,
+                        rank=None,
                         rating=0.0,  # Shopify doesn't have native ratings
                         reviews=0,
                         brand=product_data.get('vendor'),
@@ -113,6 +140,8 @@ class ShopifyScraper(BaseScraper):
                         image_url=product_data.get('images', [{}])[0].get('src') if product_data.get('images') else None,
                         in_stock=in_stock,
                         seller_count=1,
+                        delivery_days=None,
+                        buybox_owner=parsed.netloc,
                         shopify_id=str(product_data.get('id')),
                         variant_id=str(first_variant.get('id')),
                         store_domain=parsed.netloc,
@@ -133,56 +162,36 @@ class ShopifyScraper(BaseScraper):
 
         store_domain = self.get_store_domain(url)
         product_id = self.extract_product_id(url)
+        fields = await page.evaluate(EXTRACT_FIELDS_JS, self.HTML_SELECTORS)
 
         # Title - common Shopify selectors
-        title = await self._safe_text(page, '.product-title')
-        if not title:
-            title = await self._safe_text(page, 'h1.product__title')
-        if not title:
-            title = await self._safe_text(page, '[data-product-title]')
-        if not title:
-            title = await self._safe_text(page, 'h1')
+        title = fields["title"]
 
         # Price
-        price_text = await self._safe_text(page, '.product-price')
-        if not price_text:
-            price_text = await self._safe_text(page, '.price__regular .price-item')
-        if not price_text:
-            price_text = await self._safe_text(page, '[data-product-price]')
-        price = self._parse_price(price_text)
+        price = self._parse_price(fields["price"])
 
         # Compare-at price
-        compare_text = await self._safe_text(page, '.price__compare .price-item')
-        compare_price = self._parse_price(compare_text)
+        compare_price = self._parse_price(fields["compare_price"])
 
         # Brand/vendor
-        vendor = await self._safe_text(page, '.product-vendor')
-        if not vendor:
-            vendor = await self._safe_text(page, '[data-vendor]')
+        vendor = fields["vendor"]
 
         # Image
-        image_url = await self._safe_attr(page, '.product-featured-image img', 'src')
-        if not image_url:
-            image_url = await self._safe_attr(page, '.product__media img', 'src')
-
-        # Stock status
-        in_stock = True
-        oos_elem = await page.query_selector('[data-soldout]')
-        if oos_elem:
-            in_stock = False
-        add_button = await page.query_selector('[data-add-to-cart]:not([disabled])')
-        if not add_button:
-            # Check if button is disabled
-            disabled_button = await page.query_selector('[data-add-to-cart][disabled]')
-            if disabled_button:
-                in_stock = False
+        image_url = fields["image"]
+
+        # Stock status: sold-out marker, or only a disabled add-to-cart button
+        in_stock = not fields["sold_out"] and (fields["add_enabled"] or not fields["add_disabled"])
 
         return ShopifyProduct(
             platform=self.PLATFORM,
+            asin=product_id or "",
             product_id=product_id or "",
             url=url,
             title=title or "Unknown Product",
             price=price or Decimal("0"),
+            original_price=compare_price,
+            discount_percent=None,
+            rank=None,
             rating=0.0,
             reviews=0,
             brand=vendor,
@@ -190,6 +199,8 @@ class ShopifyScraper(BaseScraper):
             image_url=image_url,
             in_stock=in_stock,
             seller_count=1,
+            delivery_days=None,
+            buybox_owner=store_domain,
             shopify_id=product_id,
             store_domain=store_domain,
             vendor=vendor,
@@ -239,10 +250,14 @@ class ShopifyScraper(BaseScraper):
                     
                     products.append(ShopifyProduct(
                         platform=self.PLATFORM,
+                        asin=str(prod.get('id')),
                         product_id=str(prod.get('id')),
                         url=f"{collection_url.rsplit('/collections', 1)[0]}/products/{prod.get('handle')}",
                         title=prod.get('title', 'Unknown'),
                         price=Decimal(str(first_variant.get('price', '0'))),
+                        original_price=None,
+                        discount_percent=None,
+                        rank=None,
                         rating=0.0,
                         reviews=0,
                         brand=prod.get('vendor'),
@@ -250,6 +265,8 @@ class ShopifyScraper(BaseScraper):
                         image_url=prod.get('images', [{}])[0].get('src') if prod.get('images') else None,
                         in_stock=first_variant.get('available', True),
                         seller_count=1,
+                        delivery_days=None,
+                        buybox_owner=urlparse(collection_url).netloc,
                         shopify_id=str(prod.get('id')),
                         vendor=prod.get('vendor'),
                     ))
@@ -259,26 +276,6 @@ class ShopifyScraper(BaseScraper):
 
         return products
 
-    async def _safe_text(self, page: Page, selector: str) -> str | None:
-        """Safely get text from selector."""
-        try:
-            elem = await page.query_selector(selector)
-            if elem:
-                return (await elem.inner_text()).strip()
-        except Exception:
-            pass
-        return None
-
-    async def _safe_attr(self, page: Page, selector: str, attr: str) -> str | None:
-        """Safely get attribute from selector."""
-        try:
-            elem = await page.query_selector(selector)
-            if elem:
-                return await elem.get_attribute(attr)
-        except Exception:
-            pass
-        return None
-
     def _parse_price(self, text: str | None) -> Decimal | None:
         """Parse price from text."""
         if not text:
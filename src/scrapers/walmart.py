@@ -7,12 +7,12 @@ from decimal import Decimal
 
 from playwright.async_api import Page, Browser
 
-from .base import BaseScraper, ScrapedProduct, ScrapedMetrics
+from .base import EXTRACT_FIELDS_JS, BaseScraper, ScrapedProduct, ScrapedMetrics
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class WalmartProduct(ScrapedProduct):
     """Walmart-specific product data."""
     walmart_id: str | None = None
@@ -41,6 +41,25 @@ class WalmartScraper(BaseScraper):
         "Auto": "/browse/auto-tires/91083",
     }
 
+    # Field spec for EXTRACT_FIELDS_JS; text selectors are tried in order
+    PRODUCT_SELECTORS = {
+        "text": {
+            "title": ['h1[itemprop="name"]', '[data-testid="product-title"]'],
+            "price": ['[itemprop="price"]', '[data-testid="price-wrap"] span'],
+            "rating": ['[itemprop="ratingValue"]'],
+            "reviews": ['[itemprop="reviewCount"]'],
+            "brand": ['[itemprop="brand"]'],
+            "category": ['[data-testid="breadcrumb"] li:nth-child(2) a'],
+            "seller": ['[data-testid="sold-shipped-by"] span'],
+        },
+        "attrs": {
+            "image": ['[data-testid="hero-image"] img', 'src'],
+        },
+        "exists": {
+            "add_to_cart": '[data-testid="add-to-cart-btn"]',
+        },
+    }
+
     def extract_product_id(self, url: str) -> str | None:
         """Extract Walmart product ID from URL."""
         patterns = [
@@ -54,58 +73,58 @@ class WalmartScraper(BaseScraper):
                 return match.group(1)
         return None
 
-    async def scrape_product(self, url: str, page: Page) -> WalmartProduct | None:
-        """Scrape Walmart product page."""
+    async def scrape_product(self, url: str, page: Page | None = None) -> WalmartProduct | None:
+        """Scrape Walmart product page, on a pooled page unless one is given."""
+        if page is None:
+            async with self._page() as page:
+                return await self.scrape_product(url, page)
+
         try:
             await page.goto(url, wait_until="domcontentloaded", timeout=30000)
             await page.wait_for_timeout(2000)
 
             product_id = self.extract_product_id(url)
+            fields = await page.evaluate(EXTRACT_FIELDS_JS, self.PRODUCT_SELECTORS)
 
             # Title
-            title = await self._safe_text(page, 'h1[itemprop="name"]')
-            if not title:
-                title = await self._safe_text(page, '[data-testid="product-title"]')
+            title = fields["title"]
 
             # Price
-            price_text = await self._safe_text(page, '[itemprop="price"]')
-            if not price_text:
-                price_text = await self._safe_text(page, '[data-testid="price-wrap"] span')
-            price = self._parse_price(price_text)
+            price = self._parse_price(fields["price"])
 
             # Rating
-            rating_text = await self._safe_text(page, '[itemprop="ratingValue"]')
+            rating_text = fields["rating"]
             rating = float(rating_text) if rating_text else 0.0
 
             # Reviews
-            reviews_text = await self._safe_text(page, '[itemprop="reviewCount"]')
-            reviews = self._parse_int(reviews_text)
+            reviews = self._parse_int(fields["reviews"])
 
             # Brand
-            brand = await self._safe_text(page, '[itemprop="brand"]')
+            brand = fields["brand"]
 
             # Image
-            image_url = await self._safe_attr(page, '[data-testid="hero-image"] img', 'src')
+            image_url = fields["image"]
 
             # Category from breadcrumb
-            category = await self._safe_text(page, '[data-testid="breadcrumb"] li:nth-child(2) a')
+            category = fields["category"]
 
             # Stock status
-            in_stock = True
-            stock_elem = await page.query_selector('[data-testid="add-to-cart-btn"]')
-            if not stock_elem:
-                in_stock = False
+            in_stock = fields["add_to_cart"]
 
             # Seller info
-            seller = await self._safe_text(page, '[data-testid="sold-shipped-by"] span')
+            seller = fields["seller"]
             fulfillment = "Walmart" if "Walmart" in (seller or "") else "Marketplace"
 
             return WalmartProduct(
                 platform=self.PLATFORM,
+                asin=product_id or "",
                 product_id=product_id or "",
                 url=url,
                 title=title or "Unknown Product",
                 price=price or Decimal("0"),
+                original_price=None,
+                discount_percent=None,
+                rank=None,  # Walmart doesn't expose BSR
                 rating=rating,
                 reviews=reviews,
                 brand=brand,
@@ -113,6 +132,8 @@ class WalmartScraper(BaseScraper):
                 image_url=image_url,
                 in_stock=in_stock,
                 seller_count=1,
+                delivery_days=None,
+                buybox_owner=seller,
                 walmart_id=product_id,
                 fulfillment_type=fulfillment,
             )
@@ -170,26 +191,6 @@ class WalmartScraper(BaseScraper):
 
         return products
 
-    async def _safe_text(self, page: Page, selector: str) -> str | None:
-        """Safely get text from selector."""
-        try:
-            elem = await page.query_selector(selector)
-            if elem:
-                return (await elem.inner_text()).strip()
-        except Exception:
-            pass
-        return None
-
-    async def _safe_attr(self, page: Page, selector: str, attr: str) -> str | None:
-        """Safely get attribute from selector."""
-        try:
-            elem = await page.query_selector(selector)
-            if elem:
-                return await elem.get_attribute(attr)
-        except Exception:
-            pass
-        return None
-
     def _parse_price(self, text: str | None) -> Decimal | None:
         """Parse price from text."""
         if not text:
@@ -7,6 +7,30 @@ from unittest.mock import MagicMock
 import uuid
 
 
+def _metrics_rows(days, **fields):
+    """Newest-first MetricsRow history; each field is a constant or a function of the day index."""
+    from src.db.repositories import MetricsRow
+
+    values = {
+        "price": Decimal("99.99"),
+        "rank": 500,
+        "reviews": 1000,
+        "rating": 4.5,
+        "discount_percent": None,
+        "delivery_days": 2,
+        "seller_count": 5,
+        "in_stock": True,
+        **fields,
+    }
+    return [
+        MetricsRow(
+            date=date.today() - timedelta(days=i),
+            **{name: value(i) if callable(value) else value for name, value in values.items()},
+        )
+        for i in range(days)
+    ]
+
+
 class TestDemandForecaster:
     """Tests for DemandForecaster model."""
 
@@ -90,6 +114,75 @@ class TestDemandForecaster:
 
         assert high_forecast.predicted_daily_sales > low_forecast.predicted_daily_sales
 
+    def test_predict_batch_matches_single(self, tmp_path):
+        """Test batched prediction gives the same forecasts as per-product calls."""
+        import lightgbm as lgb
+        import numpy as np
+        from src.ml.features import FeatureEngineer
+        from src.ml.models import DemandForecaster
+
+        rng = np.random.default_rng(42)
+        X = rng.random((200, len(FeatureEngineer.get_feature_names()))) * 100
+        model_path = tmp_path / "demand_forecaster.json"
+        lgb.train(
+            {"objective": "regression", "verbose": -1},
+            lgb.Dataset(X, label=X[:, 0] * 10),
+            num_boost_round=10,
+        ).save_model(str(model_path))
+
+        forecaster = DemandForecaster(model_path=str(model_path))
+        engineer = FeatureEngineer()
+
+        features_list = []
+        for p in range(5):
+            metrics = _metrics_rows(
+                14,
+                price=lambda i: Decimal("20.00") + p * 10 + i,
+                rank=lambda i: 1000 * (p + 1) + i,
+                reviews=lambda i: 500 - i * (p + 1),
+                seller_count=3,
+            )
+            mock_product = MagicMock(id=uuid.uuid4(), category_encoded=p)
+            features_list.append(engineer.engineer_features(mock_product, metrics))
+
+        batch = forecaster.predict_batch(features_list, horizon_days=30)
+        single = [forecaster.predict(f, horizon_days=30) for f in features_list]
+
+        assert batch == single
+        assert forecaster.predict_batch([], horizon_days=30) == []
+
+    def test_model_cache_reloads_rewritten_file(self, tmp_path):
+        """Test that a cached model is reused until its file changes on disk."""
+        import os
+        import lightgbm as lgb
+        import numpy as np
+        from src.ml.features import FeatureEngineer
+        from src.ml.models import DemandForecaster
+
+        rng = np.random.default_rng(0)
+        X = rng.random((50, len(FeatureEngineer.get_feature_names())))
+        model_path = tmp_path / "demand_forecaster.json"
+
+        def save_model(mtime_ns):
+            lgb.train(
+                {"objective": "regression", "verbose": -1},
+                lgb.Dataset(X, label=X[:, 0]),
+                num_boost_round=2,
+            ).save_model(str(model_path))
+            os.utime(model_path, ns=(mtime_ns, mtime_ns))
+
+        DemandForecaster.clear_cache()
+        save_model(1_000_000_000)
+        first = DemandForecaster(model_path=str(model_path)).model
+        assert DemandForecaster(model_path=str(model_path)).model is first
+
+        save_model(2_000_000_000)
+        reloaded = DemandForecaster(model_path=str(model_path)).model
+        assert reloaded is not None and reloaded is not first
+
+        DemandForecaster.clear_cache()
+        assert DemandForecaster(model_path=str(model_path)).model is not reloaded
+
 
 class TestPricePredictor:
     """Tests for PricePredictor model."""
@@ -157,6 +250,25 @@ class TestPricePredictor:
         assert price_war is not None
         assert price_war.is_active or not price_war.is_active  # Valid result
 
+    def test_price_war_detection_accepts_arrays(self):
+        """Test price war detection gives the same result for lists and ndarrays."""
+        import numpy as np
+        from src.ml.models import PricePredictor
+
+        predictor = PricePredictor()
+
+        prices = [100.0, 102.0, 104.0, 107.0, 110.0, 112.0, 115.0, 120.0]
+        sellers = [5, 4, 3, 3, 2, 2, 2, 1]
+
+        from_lists = predictor.detect_price_war(prices, sellers)
+        from_arrays = predictor.detect_price_war(np.array(prices), np.array(sellers))
+
+        assert from_arrays == from_lists
+        assert from_lists.severity == "moderate"
+        assert from_lists.estimated_floor_price == pytest.approx(95.0)
+        no_war = predictor.detect_price_war(np.array([50.0, 49.0]), np.array([1, 1]))
+        assert no_war.severity == "none"
+
 
 class TestStockoutPredictor:
     """Tests for StockoutPredictor model."""
@@ -256,6 +368,35 @@ class TestStockoutPredictor:
 
         assert high_pred.stockout_probability >= low_pred.stockout_probability
 
+    async def test_handler_passes_history_newest_first(self):
+        """Test that predict_stockout reads its recent windows from the newest metrics."""
+        from contextlib import nullcontext
+        from unittest.mock import AsyncMock, patch
+        from src.mcp import tools
+
+        # Delivery slowed and sellers left over the last three days only
+        metrics = _metrics_rows(
+            20,
+            delivery_days=lambda i: 9 if i < 3 else 2,
+            seller_count=lambda i: 1 if i < 3 else 5,
+        )
+        product = MagicMock(id=uuid.uuid4(), title="USB Hub", category_encoded=0)
+        repo = MagicMock(
+            get_by_asin=AsyncMock(return_value=product),
+            has_min_metrics=AsyncMock(return_value=True),
+            get_metrics_columns=AsyncMock(return_value=metrics),
+        )
+
+        with patch.object(tools, "async_session_maker", nullcontext), \
+                patch.object(tools, "ProductRepository", return_value=repo):
+            report = await tools.predict_stockout_handler(
+                {"url": "https://www.amazon.com/dp/B0ABCD1234"}
+            )
+
+        assert "Delivery times increasing" in report
+        assert "Extended delivery times" in report
+        assert "Seller count declining" in report
+
 
 class TestFeatureEngineer:
     """Tests for feature engineering."""
@@ -270,6 +411,7 @@ class TestFeatureEngineer:
             id=uuid.uuid4(),
             platform="amazon_us",
             category="Electronics",
+            category_encoded=0,
             brand="TestBrand",
         )
 
@@ -325,3 +467,125 @@ class TestFeatureEngineer:
 
         # Should still return features, but with lower confidence signal
         assert features is None or features.days_tracked == 3
+
+    def test_engineer_features_from_metrics_rows(self):
+        """Test feature engineering from column-projected MetricsRow tuples."""
+        from src.ml.features import FeatureEngineer
+
+        engineer = FeatureEngineer()
+
+        mock_product = MagicMock(id=uuid.uuid4(), category="Electronics", category_encoded=0)
+
+        metrics = _metrics_rows(14, rank=lambda i: 500 + i * 10, reviews=lambda i: 1100 - i * 5)
+
+        features = engineer.engineer_features(mock_product, metrics)
+
+        assert features is not None
+        assert features.current_price == 99.99
+        assert features.current_rank == 500.0
+        assert features.review_velocity_7d == pytest.approx(30 / 7)
+        assert features.category_encoded == 0
+
+    def test_engineer_features_presorted_matches_sorted(self):
+        """Test presorted input skips the sort without changing features."""
+        from src.ml.features import FeatureEngineer
+
+        engineer = FeatureEngineer()
+
+        mock_product = MagicMock(id=uuid.uuid4(), category="Electronics", category_encoded=0)
+
+        metrics = _metrics_rows(
+            14,
+            price=lambda i: Decimal("99.99") + i,
+            rank=lambda i: 500 + i * 10,
+            reviews=lambda i: 1100 - i * 5,
+        )
+
+        presorted = engineer.engineer_features(mock_product, metrics, presorted=True)
+        resorted = engineer.engineer_features(mock_product, metrics[::-1])
+
+        assert presorted == resorted
+
+    def test_calculate_slope_matches_polyfit(self):
+        """Test closed-form slope agrees with numpy's least-squares fit."""
+        import numpy as np
+        from src.ml.features import FeatureEngineer
+
+        engineer = FeatureEngineer()
+        values = [99.99, 101.5, 98.2, 104.0, 103.1, 107.8, 106.4]
+
+        expected = np.polyfit(np.arange(len(values)), values, 1)[0]
+
+        assert engineer._calculate_slope(values) == pytest.approx(expected)
+        assert engineer._calculate_slope([5.0]) == 0.0
+
+    def test_features_list_to_matrix(self):
+        """Test matrix rows match features_to_array in feature-name order."""
+        import numpy as np
+        from src.ml.features import FeatureEngineer
+
+        engineer = FeatureEngineer()
+
+        features_list = []
+        for p in range(3):
+            metrics = _metrics_rows(
+                10,
+                price=Decimal("49.99") + p,
+                rank=lambda i: 200 + i,
+                reviews=lambda i: 300 - i,
+                rating=4.0,
+                discount_percent=lambda i: Decimal("10") if i % 2 else None,
+                delivery_days=3,
+                seller_count=2,
+            )
+            mock_product = MagicMock(id=uuid.uuid4(), category_encoded=p)
+            features_list.append(engineer.engineer_features(mock_product, metrics))
+
+        X = engineer.features_list_to_matrix(features_list)
+
+        assert X.shape == (3, len(FeatureEngineer.get_feature_names()))
+        for row, features in zip(X, features_list):
+            np.testing.assert_array_equal(row, engineer.features_to_array(features))
+        assert X[2, FeatureEngineer.get_feature_names().index("category_encoded")] == 2
+
+        buffer = np.zeros_like(X)
+        engineer.features_to_array(features_list[1], out=buffer[1])
+        np.testing.assert_array_equal(buffer[1], X[1])
+
+
+class TestModelTrainer:
+    """Tests for ModelTrainer."""
+
+    async def test_unchanged_inputs_skip_refit(self, tmp_path):
+        """Test that a model is not refit on the same training data."""
+        from unittest.mock import patch
+        import numpy as np
+        from src.ml.training import ModelTrainer, TrainingConfig
+
+        trainer = ModelTrainer(TrainingConfig(min_samples=10, model_dir=tmp_path))
+        X = np.arange(200 * 12, dtype=np.float32).reshape(200, 12)
+        y = np.arange(200, dtype=np.float32)
+
+        fits = []
+
+        class RecordingForecaster:
+            def train(self, X, y):
+                fits.append(len(X))
+
+        def dump(model, path, **kwargs):
+            path.write_bytes(b"model")
+
+        with patch("src.ml.training.DemandForecaster", RecordingForecaster), \
+                patch("src.ml.training.joblib.dump", dump):
+            first = await trainer.train_demand_model(X, y)
+            repeat = await trainer.train_demand_model(X, y)
+            changed = await trainer.train_demand_model(X, y + 1)
+
+        assert first["status"] == "success"
+        assert repeat == {
+            "status": "skipped",
+            "reason": "unchanged",
+            "model_path": first["model_path"],
+        }
+        assert changed["status"] == "success"
+        assert len(fits) == 2
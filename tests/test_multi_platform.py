@@ -13,6 +13,19 @@ from src.mcp.tools import (
 )
 
 
+def _concrete(scraper_cls):
+    """Subclass scraper_cls with the listing-page scrapers it doesn't implement yet stubbed out."""
+
+    class Concrete(scraper_cls):
+        async def scrape_category_page(self, category, page_num=1):
+            return []
+
+        async def scrape_bestseller_page(self, category):
+            return []
+
+    return Concrete
+
+
 class TestPlatformDetection:
     """Tests for platform detection from URLs."""
 
@@ -208,3 +221,752 @@ class TestCrossPlatformArbitrage:
         )
 
         assert "opportunity" in str(result).lower() or result is not None
+
+
+class TestAlibabaProductCache:
+    """Tests for AlibabaScraper's scrape result cache."""
+
+    URL = "https://www.aliexpress.com/item/1005001234567890.html"
+
+    @staticmethod
+    def _scraper():
+        from src.scrapers.alibaba import AlibabaScraper
+
+        return _concrete(AlibabaScraper)()
+
+    async def test_cached_product_skips_navigation(self):
+        """Test that a fresh cached product is returned without navigating."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        scraper = self._scraper()
+        product = MagicMock()
+        scraper._cache_product(("aliexpress", "1005001234567890"), product)
+        page = AsyncMock()
+
+        result = await scraper.scrape_product(self.URL, page)
+
+        assert result is product
+        page.goto.assert_not_awaited()
+
+    async def test_scraped_product_is_cached(self):
+        """Test that a scraped product is cached so the next scrape skips navigation."""
+        from decimal import Decimal
+        from unittest.mock import AsyncMock
+        from src.scrapers.alibaba import AlibabaProduct
+
+        scraper = self._scraper()
+        page = AsyncMock()
+        page.evaluate.return_value = {
+            "title": "Wireless Earbuds", "price": "US $12.50", "rating": "4.7",
+            "reviews": "310", "orders": "1,000+ sold", "store_name": "Acme Store", "image": None,
+        }
+
+        product = await scraper.scrape_product(self.URL, page)
+
+        assert isinstance(product, AlibabaProduct)
+        assert product.asin == "1005001234567890"
+        assert product.price == Decimal("12.50")
+        assert await scraper.scrape_product(self.URL, page) is product
+        page.goto.assert_awaited_once()
+
+    async def test_expired_product_is_rescraped(self):
+        """Test that entries older than the TTL trigger a new navigation."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        scraper = self._scraper()
+        scraper.PRODUCT_CACHE_TTL = -1
+        scraper._cache_product(("aliexpress", "1005001234567890"), MagicMock())
+        page = AsyncMock()
+
+        await scraper.scrape_product(self.URL, page)
+
+        page.goto.assert_awaited_once()
+
+    async def test_metrics_from_given_product_skip_scrape(self):
+        """Test that scrape_metrics reuses a product passed in by the caller."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        scraper = self._scraper()
+        product = MagicMock(reviews=120, rating=4.5, in_stock=True, supplier_name="Acme")
+        page = AsyncMock()
+
+        metrics = await scraper.scrape_metrics(self.URL, page, product=product)
+
+        assert metrics.reviews == 120
+        assert metrics.buybox_owner == "Acme"
+        page.goto.assert_not_awaited()
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache stays bounded by evicting the oldest entry."""
+        from unittest.mock import MagicMock
+
+        scraper = self._scraper()
+        scraper.PRODUCT_CACHE_MAXSIZE = 2
+        scraper._cache_product(("alibaba", "1"), MagicMock())
+        scraper._cache_product(("alibaba", "2"), MagicMock())
+        scraper._get_cached_product(("alibaba", "1"))
+        scraper._cache_product(("alibaba", "3"), MagicMock())
+
+        assert scraper._get_cached_product(("alibaba", "1")) is not None
+        assert scraper._get_cached_product(("alibaba", "2")) is None
+        assert scraper._get_cached_product(("alibaba", "3")) is not None
+
+
+class TestAmazonFieldParsing:
+    """Tests for AmazonScraper's parsers of page.evaluate output."""
+
+    def test_parse_price(self):
+        """Test price extraction from offscreen price text."""
+        from decimal import Decimal
+        from src.scrapers.amazon import AmazonScraper
+
+        scraper = AmazonScraper()
+
+        assert scraper._parse_price("$1,029.99") == Decimal("1029.99")
+        assert scraper._parse_price(None) is None
+
+    def test_parse_rank(self):
+        """Test rank extraction from a Best Sellers Rank row."""
+        from src.scrapers.amazon import AmazonScraper
+
+        scraper = AmazonScraper()
+
+        assert scraper._parse_rank("Best Sellers Rank #1,234 in Electronics") == 1234
+        assert scraper._parse_rank(None) is None
+
+    def test_parse_text_fields(self):
+        """Test rating, reviews, brand and availability parsing."""
+        from src.scrapers.amazon import AmazonScraper
+
+        scraper = AmazonScraper()
+
+        assert scraper._parse_rating("4.5 out of 5 stars") == 4.5
+        assert scraper._parse_reviews("12,345 ratings") == 12345
+        assert scraper._parse_brand("Visit the Acme Store") == "Acme"
+        assert scraper._parse_availability("Currently unavailable.") is False
+        assert scraper._parse_availability(None) is True
+        assert scraper._parse_seller_count(None) == 1
+
+
+class TestFlipkartExtraction:
+    """Tests for FlipkartScraper.scrape_product."""
+
+    async def test_fields_read_in_one_evaluate(self):
+        """Test that product fields come from one evaluate and are parsed in Python."""
+        from decimal import Decimal
+        from unittest.mock import AsyncMock
+        from src.scrapers.flipkart import _EXTRACT_PRODUCT_JS, FlipkartScraper
+
+        scraper = FlipkartScraper()
+        page = AsyncMock()
+        page.evaluate.return_value = {
+            "title": "Redmi Note 13", "price": "₹17,999", "original_price": "₹20,999",
+            "rating": "4.3", "reviews": "1,234 Ratings & 567 Reviews", "category": "Mobiles",
+            "brand": None, "image": "phone.jpg", "availability": None, "seller": "RetailNet",
+            "delivery": "Delivery in 3 days",
+        }
+        scraper._get_page = AsyncMock(return_value=page)
+        scraper._release_page = AsyncMock()
+        scraper._random_delay = AsyncMock()
+        scraper._is_blocked = AsyncMock(return_value=False)
+        scraper._close_login_popup = AsyncMock()
+
+        product = await scraper.scrape_product("https://www.flipkart.com/redmi/p/itm123?pid=MOBGTAGPTB3")
+
+        page.evaluate.assert_awaited_once_with(_EXTRACT_PRODUCT_JS, FlipkartScraper.SELECTORS)
+        page.query_selector_all.assert_not_awaited()
+        scraper._release_page.assert_awaited_once_with(page)
+        assert product.asin == "MOBGTAGPTB3"
+        assert product.price == Decimal("17999")
+        assert round(product.discount_percent, 1) == 14.3
+        assert product.reviews == 1234
+        assert product.in_stock is True
+        assert product.delivery_days == 3
+        assert product.buybox_owner == "RetailNet"
+
+    async def test_listing_links_read_in_one_call(self):
+        """Test that category links come back from one eval_on_selector_all call."""
+        from unittest.mock import AsyncMock
+        from src.scrapers.flipkart import FlipkartScraper
+
+        scraper = FlipkartScraper()
+        page = AsyncMock()
+        page.eval_on_selector_all.return_value = [
+            "https://www.flipkart.com/b/p/itm2?pid=B2",
+            "https://www.flipkart.com/offers",
+            "https://www.flipkart.com/a/p/itm1?pid=A1",
+            "https://www.flipkart.com/b/p/itm2?pid=B2",
+        ]
+        scraper._get_page = AsyncMock(return_value=page)
+        scraper._release_page = AsyncMock()
+        scraper._random_delay = AsyncMock()
+        scraper._is_blocked = AsyncMock(return_value=False)
+        scraper._close_login_popup = AsyncMock()
+
+        urls = await scraper.scrape_category_page("Mobiles")
+
+        page.eval_on_selector_all.assert_awaited_once()
+        page.query_selector_all.assert_not_awaited()
+        # De-duplicated in page order
+        assert urls == [
+            "https://www.flipkart.com/b/p/itm2?pid=B2",
+            "https://www.flipkart.com/a/p/itm1?pid=A1",
+        ]
+
+    async def test_block_check_reads_visible_text_prefix(self):
+        """Test that block detection scans the visible text, not the page HTML."""
+        from unittest.mock import AsyncMock
+        from src.scrapers.flipkart import FlipkartScraper
+
+        scraper = FlipkartScraper()
+        page = AsyncMock(url="https://www.flipkart.com/p/itm1")
+
+        page.evaluate.return_value = "Please Verify You Are A Human"
+        assert await scraper._is_blocked(page) is True
+
+        page.evaluate.return_value = "Eureka Forbes Robot Vacuum Cleaner"
+        assert await scraper._is_blocked(page) is False
+        page.content.assert_not_awaited()
+
+    async def test_login_popup_closed_only_when_visible(self):
+        """Test that the login popup is clicked only if visible, with no settle sleep."""
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers.flipkart import FlipkartScraper
+
+        scraper = FlipkartScraper()
+        for visible in (False, True):
+            page = MagicMock(wait_for_timeout=AsyncMock())
+            button = page.locator.return_value.first
+            button.is_visible = AsyncMock(return_value=visible)
+            button.click = AsyncMock()
+
+            await scraper._close_login_popup(page)
+
+            page.locator.assert_called_once_with(scraper.LOGIN_POPUP_CLOSE_SELECTOR)
+            assert button.click.await_count == int(visible)
+            page.wait_for_timeout.assert_not_awaited()
+
+    async def test_block_check_reads_text_only_when_status_and_url_are_clean(self):
+        """Test that a blocking status or captcha URL short-circuits the page text read."""
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers.flipkart import FlipkartScraper
+
+        scraper = FlipkartScraper()
+        cases = [
+            (403, "https://www.flipkart.com/p/itm1", "", True, False),
+            (200, "https://www.flipkart.com/captcha?r=1", "", True, False),
+            (200, "https://www.flipkart.com/p/itm1", "Are you a robot?", True, True),
+            (200, "https://www.flipkart.com/p/itm1", "Redmi Note 13", False, True),
+        ]
+        for status, url, text, blocked, reads_text in cases:
+            page = MagicMock(url=url, evaluate=AsyncMock(return_value=text))
+
+            assert await scraper._is_blocked(page, MagicMock(status=status)) is blocked
+            assert page.evaluate.await_count == int(reads_text)
+
+
+class TestBrowserContextPool:
+    """Tests for BaseScraper's pooled browser contexts."""
+
+    async def test_heavy_resources_blocked_by_type(self):
+        """Test that images/fonts/media are aborted and everything else continues."""
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers.base import BaseScraper
+
+        for resource_type, blocked in [("image", True), ("font", True), ("media", True),
+                                       ("document", False), ("stylesheet", False), ("xhr", False)]:
+            route = AsyncMock()
+            await BaseScraper._block_heavy_resources(route, MagicMock(resource_type=resource_type))
+            assert route.abort.await_count == int(blocked)
+            assert route.continue_.await_count == int(not blocked)
+
+    async def test_page_context_manager_releases_page(self):
+        """Test that _page hands the page back to the pool on exit."""
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers.amazon import AmazonScraper
+
+        scraper = AmazonScraper()
+        scraper.browser = MagicMock()
+        context = MagicMock(close=AsyncMock())
+        page = MagicMock(context=context, close=AsyncMock())
+        context.new_page = AsyncMock(return_value=page)
+        scraper._idle_contexts = [context]
+        scraper._context_uses[context] = 0
+
+        async with scraper._page() as pooled:
+            assert pooled is page
+            assert scraper._idle_contexts == []
+
+        page.close.assert_awaited_once()
+        assert scraper._idle_contexts == [context]
+        assert scraper._context_uses[context] == 1
+
+    async def test_contexts_are_reused_then_retired(self):
+        """Test that pages share contexts, bounded in number and uses."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers.amazon import AmazonScraper
+
+        scraper = AmazonScraper()
+        scraper.browser = MagicMock()
+        scraper._pool_size = 4
+        scraper._context_slots = asyncio.Semaphore(4)
+        scraper.CONTEXT_MAX_USES = 3
+        created = []
+
+        async def new_context():
+            context = MagicMock(close=AsyncMock())
+            context.new_page = AsyncMock(
+                side_effect=lambda: MagicMock(context=context, close=AsyncMock())
+            )
+            created.append(context)
+            scraper._context_uses[context] = 0
+            return context
+
+        scraper._new_context = new_context
+
+        async def scrape():
+            page = await scraper._get_page()
+            await asyncio.sleep(0.01)
+            await scraper._release_page(page)
+
+        await asyncio.wait_for(asyncio.gather(*(scrape() for _ in range(16))), timeout=5)
+
+        # Which context a waiter gets depends on wake-up order, so check the
+        # invariants: retired contexts served exactly 3 pages, the rest idle
+        uses = [c.new_page.await_count for c in created]
+        retired = [c for c in created if c.close.await_count]
+        assert sum(uses) == 16
+        assert max(uses) <= 3
+        assert all(c.new_page.await_count == 3 for c in retired)
+        assert len(scraper._idle_contexts) == len(created) - len(retired) <= 4
+
+    async def test_playwright_driver_is_shared(self):
+        """Test that concurrent scrapers start one Playwright driver and stop it once."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from src.scrapers import base
+
+        driver = MagicMock(stop=AsyncMock())
+        starter = MagicMock()
+        starter.return_value.start = AsyncMock(return_value=driver)
+
+        with patch.object(base, "async_playwright", starter):
+            first, second = await asyncio.gather(base.get_playwright(), base.get_playwright())
+            assert first is second is driver
+            starter.assert_called_once()
+            await base.stop_playwright()
+
+        driver.stop.assert_awaited_once()
+        assert base._playwright_start is None
+
+    async def test_page_taking_scrapers_borrow_a_pooled_page(self):
+        """Test that scrape_product(url) with no page (as scrape_with_retry calls it) is pooled."""
+        from unittest.mock import AsyncMock
+        from src.scrapers.walmart import WalmartScraper
+
+        scraper = _concrete(WalmartScraper)()
+        page = AsyncMock()
+        page.goto.side_effect = RuntimeError("blocked")
+        scraper._get_page = AsyncMock(return_value=page)
+        scraper._release_page = AsyncMock()
+
+        assert await scraper.scrape_product("https://www.walmart.com/ip/123") is None
+
+        page.goto.assert_awaited_once()
+        scraper._release_page.assert_awaited_once_with(page)
+
+    async def test_scrape_many_overlaps_scrapes_in_order(self):
+        """Test that scrape_many bounds concurrency and returns results in input order."""
+        import asyncio
+        from src.scrapers.amazon import AmazonScraper
+
+        scraper = AmazonScraper()
+        in_flight = peak = 0
+
+        async def scrape_with_retry(url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if url == "bad":
+                raise RuntimeError("boom")
+            return url.upper()
+
+        scraper.scrape_with_retry = scrape_with_retry
+
+        results = await scraper.scrape_many(["a", "bad", "c", "d", "e"], concurrency=2)
+
+        assert results == ["A", None, "C", "D", "E"]
+        assert peak == 2
+
+    async def test_scrape_products_makes_one_attempt_per_url(self):
+        """Test that scrape_products calls scrape_product directly, once per URL."""
+        from unittest.mock import AsyncMock
+        from src.scrapers.amazon import AmazonScraper
+
+        scraper = AmazonScraper()
+        scraper.scrape_product = AsyncMock(side_effect=["A", RuntimeError("blocked"), None])
+        scraper.scrape_with_retry = AsyncMock()
+
+        results = await scraper.scrape_products(["a", "b", "c"], concurrency=3)
+
+        assert results == ["A", None, None]
+        assert scraper.scrape_product.await_count == 3
+        scraper.scrape_with_retry.assert_not_awaited()
+
+    async def test_scrape_products_defaults_to_pool_size(self):
+        """Test that scrape_products without a concurrency never outruns the context pool."""
+        import asyncio
+        from src.scrapers.amazon import AmazonScraper
+
+        scraper = AmazonScraper()
+        in_flight = peak = 0
+
+        async def scrape_product(url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return url
+
+        scraper.scrape_product = scrape_product
+        urls = [str(i) for i in range(scraper._pool_size + 3)]
+
+        assert await scraper.scrape_products(urls) == urls
+        assert peak == scraper._pool_size
+
+
+class TestWalmartExtraction:
+    """Tests for WalmartScraper.scrape_product."""
+
+    async def test_fields_read_in_one_evaluate(self):
+        """Test that product fields come from a single evaluate of the class spec."""
+        from decimal import Decimal
+        from unittest.mock import AsyncMock
+        from src.scrapers.base import EXTRACT_FIELDS_JS
+        from src.scrapers.walmart import WalmartProduct, WalmartScraper
+
+        page = AsyncMock()
+        page.evaluate.return_value = {
+            "title": "Air Fryer", "price": "$49.99", "rating": "4.6", "reviews": "(2,031)",
+            "brand": "Ninja", "category": "Home", "seller": "Sold and shipped by Walmart.com",
+            "image": None, "add_to_cart": False,
+        }
+
+        product = await _concrete(WalmartScraper)().scrape_product(
+            "https://www.walmart.com/ip/air-fryer/123", page
+        )
+
+        page.evaluate.assert_awaited_once_with(EXTRACT_FIELDS_JS, WalmartScraper.PRODUCT_SELECTORS)
+        page.query_selector.assert_not_awaited()
+        assert isinstance(product, WalmartProduct)
+        assert product.asin == "123"
+        assert product.walmart_id == "123"
+        assert product.price == Decimal("49.99")
+        assert product.rating == 4.6
+        assert product.reviews == 2031
+        assert product.in_stock is False
+        assert product.fulfillment_type == "Walmart"
+
+
+class TestShopifyExtraction:
+    """Tests for ShopifyScraper's HTML fallback."""
+
+    async def test_html_fields_read_in_one_evaluate(self):
+        """Test that the HTML fallback reads every field in one evaluate."""
+        from decimal import Decimal
+        from unittest.mock import AsyncMock
+        from src.scrapers.base import EXTRACT_FIELDS_JS
+        from src.scrapers.shopify import ShopifyProduct, ShopifyScraper
+
+        page = AsyncMock()
+        page.evaluate.return_value = {
+            "title": "Linen Shirt", "price": "$80.00", "compare_price": "$100.00", "vendor": "Acme",
+            "image": None, "sold_out": False, "add_enabled": False, "add_disabled": True,
+        }
+
+        product = await _concrete(ShopifyScraper)()._scrape_html(
+            "https://store.example.com/products/linen-shirt", page
+        )
+
+        page.evaluate.assert_awaited_once_with(EXTRACT_FIELDS_JS, ShopifyScraper.HTML_SELECTORS)
+        page.query_selector.assert_not_awaited()
+        assert isinstance(product, ShopifyProduct)
+        assert product.asin == "linen-shirt"
+        assert product.shopify_id == "linen-shirt"
+        assert product.compare_at_price == Decimal("100.00")
+        assert product.in_stock is False
+
+
+class TestEbaySearch:
+    """Tests for EbayScraper search."""
+
+    async def test_listings_are_scraped_concurrently(self):
+        """Test that search results are fetched in parallel, bounded and rate limited."""
+        import asyncio
+        from contextlib import asynccontextmanager
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from src.scrapers import base
+        from src.scrapers.ebay import EbayProduct, EbayScraper
+        from src.scrapers.proxy_manager import CircuitBreaker
+
+        scraper = _concrete(EbayScraper)()
+        in_flight = 0
+        peak = 0
+        search_page_held = False
+
+        async def scrape_product(url, page=None):
+            nonlocal in_flight, peak
+            assert not search_page_held
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if url.endswith("/3"):
+                return None
+            return MagicMock(spec=EbayProduct, url=url)
+
+        page = AsyncMock()
+        page.locator = MagicMock()
+        page.locator.return_value.first.wait_for = AsyncMock()
+        item_urls = [f"https://www.ebay.com/itm/{i}" for i in range(scraper._pool_size + 3)]
+        page.eval_on_selector_all.return_value = [*item_urls, "https://www.ebay.com/sch/other"]
+
+        @asynccontextmanager
+        async def pooled_page():
+            nonlocal search_page_held
+            search_page_held = True
+            yield page
+            search_page_held = False
+
+        scraper.scrape_product = scrape_product
+        scraper._page = pooled_page
+        limiter = MagicMock(acquire=AsyncMock())
+
+        with patch.object(base, "rate_limiter", limiter), \
+                patch.object(base, "circuit_breaker", CircuitBreaker(failure_threshold=5)), \
+                patch.object(base.random, "uniform", return_value=0):
+            products = await scraper.search_products_detailed("usb hub")
+
+        assert [p.url for p in products] == [url for url in item_urls if not url.endswith("/3")]
+        assert 1 < peak <= scraper._pool_size
+        assert limiter.acquire.await_count == len(item_urls)
+
+    async def test_search_reads_listing_tiles(self):
+        """Test that the default search builds products from tiles without visiting items."""
+        from decimal import Decimal
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers import ebay
+        from src.scrapers.ebay import EbayProduct, EbayScraper
+
+        scraper = _concrete(EbayScraper)()
+        scraper.scrape_product = AsyncMock()
+        page = AsyncMock()
+        page.locator = MagicMock()
+        page.locator.return_value.first.wait_for = AsyncMock()
+        page.evaluate.return_value = [
+            {"href": "https://www.ebay.com/itm/111", "title": "USB Hub", "price": "$19.99",
+             "image": None, "condition": "Brand New", "bids": None, "best_offer": True},
+            {"href": "https://www.ebay.com/itm/222", "title": "Old Hub", "price": "$5.00",
+             "image": None, "condition": None, "bids": "3 bids", "best_offer": False},
+        ]
+
+        products = await scraper.search_products("usb hub", page, limit=2)
+
+        scraper.scrape_product.assert_not_awaited()
+        page.evaluate.assert_awaited_once_with(ebay._SEARCH_TILES_JS, 2)
+        assert all(isinstance(p, EbayProduct) for p in products)
+        assert [p.ebay_id for p in products] == ["111", "222"]
+        assert products[0].asin == "111"
+        assert products[0].price == Decimal("19.99")
+        assert products[0].listing_type == "best_offer"
+        assert products[0].condition == "brand new"
+        assert products[1].listing_type == "auction"
+        assert products[1].bids == 3
+
+
+class TestEbayMetrics:
+    """Tests for EbayScraper.scrape_metrics."""
+
+    async def test_metrics_read_only_metric_fields(self):
+        """Test that the daily metrics pass evaluates the small field spec."""
+        from decimal import Decimal
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers.base import EXTRACT_FIELDS_JS
+        from src.scrapers.ebay import EbayScraper
+
+        scraper = _concrete(EbayScraper)()
+        page = AsyncMock()
+        page.locator = MagicMock()
+        page.locator.return_value.first.wait_for = AsyncMock()
+        page.evaluate.return_value = {
+            "price": "US $1,299.99", "sold": "1,204 sold", "out_of_stock": False,
+        }
+
+        metrics = await scraper.scrape_metrics("https://www.ebay.com/itm/123", page)
+
+        page.evaluate.assert_awaited_once_with(EXTRACT_FIELDS_JS, EbayScraper.METRICS_SELECTORS)
+        assert "title" not in EbayScraper.METRICS_SELECTORS["text"]
+        assert metrics.price == Decimal("1299.99")
+        assert metrics.reviews == 1204
+        assert metrics.in_stock is True
+
+
+class TestEbayHttpPath:
+    """Tests for EbayScraper's browserless listing scrape."""
+
+    def test_xpath_spec_mirrors_css_spec(self):
+        """Test that the static-HTML extractor yields the same fields as the in-page one."""
+        from src.scrapers.base import extract_fields_xpath
+        from src.scrapers.ebay import EbayScraper
+
+        html = b"""<html><body>
+            <h1 class="x-item-title__mainTitle"><span>USB   Hub</span></h1>
+            <div class="x-price-primary"><span>US $19.99</span></div>
+            <span class="x-bid-count">3 bids</span>
+            <div class="ux-image-carousel-item"><img src="hub.jpg"></div>
+        </body></html>"""
+
+        fields = extract_fields_xpath(html, EbayScraper.PRODUCT_XPATHS)
+
+        css = EbayScraper.PRODUCT_SELECTORS
+        assert set(fields) == set(css["text"]) | set(css["attrs"]) | set(css["exists"])
+        assert fields["title"] == "USB Hub"
+        assert fields["price"] == "US $19.99"
+        assert fields["image"] == "hub.jpg"
+        assert fields["auction"] is True
+        assert fields["condition"] is None
+        assert fields["out_of_stock"] is False
+
+    async def test_http_scrape_builds_product(self):
+        """Test that a listing fetched over HTTP becomes a real EbayProduct."""
+        from decimal import Decimal
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers.ebay import EbayProduct, EbayScraper
+
+        scraper = _concrete(EbayScraper)()
+        scraper._http = MagicMock(get=AsyncMock(return_value=MagicMock(
+            status_code=200,
+            content=b"""<html><body>
+                <h1 class="x-item-title__mainTitle"><span>USB Hub</span></h1>
+                <div class="x-price-primary"><span>US $19.99</span></div>
+            </body></html>""",
+        )))
+
+        product = await scraper.scrape_product_http("https://www.ebay.com/itm/123")
+
+        assert isinstance(product, EbayProduct)
+        assert product.asin == product.ebay_id == "123"
+        assert product.title == "USB Hub"
+        assert product.price == Decimal("19.99")
+
+    async def test_falls_back_to_browser_when_http_unusable(self):
+        """Test that scrape_product only takes a browser page when the HTTP path fails."""
+        from unittest.mock import AsyncMock, MagicMock
+        from src.scrapers.ebay import EbayScraper
+
+        scraper = _concrete(EbayScraper)()
+        page = AsyncMock()
+        page.locator = MagicMock()
+        page.locator.return_value.first.wait_for = AsyncMock()
+        scraper._get_page = AsyncMock(return_value=page)
+        scraper._release_page = AsyncMock()
+        url = "https://www.ebay.com/itm/123"
+
+        fetched = MagicMock()
+        scraper.scrape_product_http = AsyncMock(return_value=fetched)
+        assert await scraper.scrape_product(url) is fetched
+        scraper._get_page.assert_not_awaited()
+
+        # e.g. a bot-check page with no item title
+        scraper.scrape_product_http = AsyncMock(return_value=None)
+        await scraper.scrape_product(url)
+        scraper._get_page.assert_awaited_once()
+
+
+class TestTokenBucket:
+    """Tests for the per-platform token-bucket rate limiter."""
+
+    async def test_burst_then_waits_for_refill(self):
+        """Test that a full bucket allows a burst and then paces callers."""
+        from unittest.mock import AsyncMock, patch
+        from src.scrapers import proxy_manager
+        from src.scrapers.proxy_manager import TokenBucket
+
+        with patch.object(proxy_manager.time, "monotonic", return_value=100.0), \
+                patch.object(proxy_manager.asyncio, "sleep", new=AsyncMock()) as sleep:
+            bucket = TokenBucket(capacity=2, rate=0.5)
+            await bucket.acquire()
+            await bucket.acquire()
+            sleep.assert_not_awaited()
+
+            await bucket.acquire()
+            sleep.assert_awaited_once_with(2.0)
+            await bucket.acquire()
+            assert sleep.await_args.args == (4.0,)
+
+    def test_buckets_are_per_platform(self):
+        """Test that each platform gets its own bucket sized from the limiter."""
+        from src.scrapers.proxy_manager import RateLimiter
+
+        limiter = RateLimiter(requests_per_minute=30, burst=3)
+        amazon = limiter.bucket_for("amazon_us")
+
+        assert limiter.bucket_for("amazon_us") is amazon
+        assert limiter.bucket_for("ebay_us") is not amazon
+        assert amazon.capacity == 3
+        assert amazon.rate == 0.5
+
+    async def test_expensive_pages_cost_more_tokens(self):
+        """Test that eBay auction URLs draw two tokens and others one."""
+        from src.scrapers.ebay import EbayScraper
+        from src.scrapers.proxy_manager import RateLimiter
+
+        scraper = _concrete(EbayScraper)()
+        assert scraper._request_cost("https://www.ebay.com/itm/123") == 1.0
+        assert scraper._request_cost("https://www.ebay.com/itm/123?LH_Auction=1") == 2.0
+        assert scraper._request_cost("https://www.ebay.com/bid/123") == 2.0
+        assert scraper._request_cost("https://www.ebay.com/itm/forbidden-bidet-123") == 1.0
+        assert scraper._request_cost("https://www.ebay.com/itm/123?campid=bid_auction") == 1.0
+
+        limiter = RateLimiter(requests_per_minute=1, burst=5)
+        await limiter.acquire("ebay_us", cost=2.0)
+        assert limiter.bucket_for("ebay_us").tokens == pytest.approx(3.0, abs=0.01)
+
+
+class TestCircuitBreaker:
+    """Tests for the half-open circuit breaker."""
+
+    async def test_single_probe_after_timeout(self):
+        """Test that only one caller probes a tripped platform and backoff doubles."""
+        from unittest.mock import patch
+        from src.scrapers import proxy_manager
+        from src.scrapers.proxy_manager import CircuitBreaker
+
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, max_reset_timeout=15)
+        with patch.object(proxy_manager.time, "monotonic", return_value=0.0) as clock:
+            breaker.record_failure("ebay_us")
+            assert await breaker.allow("ebay_us")
+            breaker.record_failure("ebay_us")
+            assert breaker.is_open("ebay_us")
+            assert not await breaker.allow("ebay_us")
+
+            clock.return_value = 10.0
+            assert not breaker.is_open("ebay_us")
+            assert await breaker.allow("ebay_us")
+            assert not await breaker.allow("ebay_us")
+
+            # Failed probe reopens for longer, capped at max_reset_timeout
+            breaker.record_failure("ebay_us")
+            clock.return_value = 24.0
+            assert not await breaker.allow("ebay_us")
+            clock.return_value = 25.0
+            assert await breaker.allow("ebay_us")
+
+            breaker.record_success("ebay_us")
+            assert await breaker.allow("ebay_us")
+            assert await breaker.allow("ebay_us")
+            assert breaker.circuits["ebay_us"].reset_timeout == 10